@@ -13,7 +13,7 @@ datas = []
 binaries = []
 hiddenimports = []
 
-for pkg in ("cv2", "PIL"):
+for pkg in ("cv2",):
     pkg_datas, pkg_binaries, pkg_hidden = collect_all(pkg)
     datas += pkg_datas
     binaries += pkg_binaries
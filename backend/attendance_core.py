@@ -1,12 +1,16 @@
 from __future__ import annotations
 
-from collections import Counter, deque
+from collections import deque
 import cv2
+import numpy as np
 import pandas as pd
 import math
 import logging
+import os
+import time
 from datetime import datetime
-from typing import Callable, Dict, Tuple, cast
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Tuple, cast
 
 from shared.paths import assets_dir, data_dir, models_dir
 from backend.storage import Storage
@@ -17,11 +21,27 @@ ASSETS_DIR = assets_dir()
 MODELS_DIR = models_dir()
 DATASET_DIR = DATA_DIR / 'dataset'
 CASCADE_PATH = ASSETS_DIR / 'haarcascade_frontalface_default.xml'
+# Optional OpenCV Zoo YuNet model; when bundled it replaces the Haar cascade for detection.
+DNN_DETECTOR_PATH = ASSETS_DIR / 'face_detection_yunet_2023mar.onnx'
+DNN_SCORE_THRESHOLD = 0.5
 MODEL_PATH = MODELS_DIR / 'trainer.yml'
 USER_DETAILS_FILE = DATA_DIR / 'UserDetails.csv'
 ATTENDANCE_FILE = DATA_DIR / 'Attendance.csv'
 CLAHE = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
 FACE_SIZE = (200, 200)
+MIN_FACE_SIDE = 80
+# Detection runs on a downscaled frame, and only every DETECT_EVERY frames; boxes are
+# reused in between (faces barely move between consecutive webcam frames).
+DETECT_SCALE = 0.5
+DETECT_EVERY = 2
+# A frame whose thumbnail differs from the last processed frame by less than
+# STATIC_DIFF_THRESHOLD (mean abs grey level) reuses the previous boxes and per-face
+# predictions: no CLAHE, detection or LBPH predict, and no new votes for the stable window
+# (a frozen frame is not independent evidence).
+# At most STATIC_REUSE_MAX frames in a row are reused to avoid drifting on slow changes.
+STATIC_THUMB_SIZE = (80, 60)
+STATIC_DIFF_THRESHOLD = 2.0
+STATIC_REUSE_MAX = 15
 FaceMap = Dict[int, str]
 StatusCallback = Callable[[str], None]
 LogCallback = Callable[[str, str], None]
@@ -31,6 +51,17 @@ USER_COLUMNS = ['Id', 'Name']
 _STORAGE = Storage()
 _STORAGE.migrate_from_csv_if_needed()
 
+# Frozen builds have been seen with SIMD dispatch disabled; force it on and cap the
+# OpenCV thread pool so cascade/CLAHE don't oversubscribe small machines.
+cv2.setUseOptimized(True)
+cv2.setNumThreads(min(4, os.cpu_count() or 1))
+_CV_INFO_LOGGED = False
+
+_LN2 = math.log(2.0)
+
+# Parsed artefacts reused across recognition sessions, keyed by the source file's mtime.
+_MODEL_CACHE: dict[str, tuple[Hashable, Any]] = {}
+
 
 def _lbph_match_quality(distance: float, threshold: float) -> float:
     """Map LBPH distance (lower is better) into a 0-100 display value.
@@ -41,29 +72,237 @@ def _lbph_match_quality(distance: float, threshold: float) -> float:
     - distance = threshold => ~50%
     """
 
-    threshold = float(threshold) if threshold and threshold > 0 else 100.0
+    if not threshold or threshold <= 0:
+        threshold = 100.0
     # exp(-ln(2) * d/t) gives 50% at d=t.
-    quality = 100.0 * math.exp(-math.log(2.0) * (float(distance) / threshold))
+    quality = 100.0 * math.exp(-_LN2 * distance / threshold)
     return max(0.0, min(100.0, quality))
 
 
+def _to_gray(frame, use_opencl: bool):
+    """Grayscale one camera frame (no-op for single-channel frames).
+
+    With OpenCL available this returns a `cv2.UMat` (T-API) so CLAHE and detection stay
+    on the device; callers download the enhanced image with `.get()` only when a face
+    ROI is needed, since LBPH `predict()` is CPU-only.
+    """
+
+    if frame.ndim == 2:
+        # Mono camera (GREY/Y800 FOURCC): already single-channel.
+        return cv2.UMat(frame) if use_opencl else frame
+    if use_opencl:
+        return cv2.cvtColor(cv2.UMat(frame), cv2.COLOR_BGR2GRAY)
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+
+def _detect_faces(detector, enhanced, frame) -> np.ndarray:
+    """Detect faces on a downscaled copy and map boxes back to full resolution.
+
+    Detection cost scales with pixel count, so detecting at `DETECT_SCALE` is much
+    cheaper; recognition still uses the full-resolution ROI. The Haar cascade runs on
+    the CLAHE-enhanced frame, the YuNet DNN detector on the raw (colour) frame.
+    """
+
+    min_side = int(MIN_FACE_SIDE * DETECT_SCALE)
+    if isinstance(detector, cv2.FaceDetectorYN):
+        small = cv2.resize(
+            frame, None, fx=DETECT_SCALE, fy=DETECT_SCALE, interpolation=cv2.INTER_AREA
+        )
+        if small.ndim == 2:
+            small = cv2.cvtColor(small, cv2.COLOR_GRAY2BGR)
+        detector.setInputSize((small.shape[1], small.shape[0]))
+        _, detections = detector.detect(small)
+        if detections is None:
+            return np.empty((0, 4), dtype=int)
+        faces = np.maximum(detections[:, :4], 0)
+        faces = faces[(faces[:, 2] >= min_side) & (faces[:, 3] >= min_side)]
+    else:
+        small = cv2.resize(
+            enhanced, None, fx=DETECT_SCALE, fy=DETECT_SCALE, interpolation=cv2.INTER_AREA
+        )
+        faces = detector.detectMultiScale(
+            small, scaleFactor=1.1, minNeighbors=6, minSize=(min_side, min_side)
+        )
+    if len(faces) == 0:
+        return np.empty((0, 4), dtype=int)
+    return (np.asarray(faces) / DETECT_SCALE).round().astype(int)
+
+
+class _RollingVotes:
+    """Sliding window of recent label matches with incremental counts and distance sums.
+
+    Replaces rebuilding a `Counter` over the window for every face: pushes update the
+    per-label count and rolling distance sum in O(1), and the leader is only recomputed
+    when the current leader loses a vote to eviction.
+    """
+
+    def __init__(self, window: int) -> None:
+        self._window = max(1, window)
+        self._labels: deque[int] = deque(maxlen=self._window)
+        self._counts: dict[int, int] = {}
+        self._distances: dict[int, deque[float]] = {}
+        self._distance_sums: dict[int, float] = {}
+        self._leader: int | None = None
+        self._leader_count = 0
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def push(self, label: int, distance: float) -> None:
+        if len(self._labels) == self._window:
+            evicted = self._labels[0]
+            self._counts[evicted] -= 1
+            if evicted == self._leader:
+                self._leader, self._leader_count = max(
+                    self._counts.items(), key=lambda item: item[1]
+                )
+        self._labels.append(label)
+        count = self._counts.get(label, 0) + 1
+        self._counts[label] = count
+        if count > self._leader_count:
+            self._leader, self._leader_count = label, count
+
+        distances = self._distances.get(label)
+        if distances is None:
+            distances = self._distances[label] = deque(maxlen=self._window)
+            self._distance_sums[label] = 0.0
+        if len(distances) == self._window:
+            self._distance_sums[label] -= distances[0]
+        distances.append(distance)
+        self._distance_sums[label] += distance
+
+    def leader(self) -> tuple[int | None, int]:
+        return self._leader, self._leader_count
+
+    def mean_distance(self, label: int) -> float | None:
+        distances = self._distances.get(label)
+        if not distances:
+            return None
+        return self._distance_sums[label] / len(distances)
+
+
+def _log_cv_info(logger: logging.Logger) -> None:
+    global _CV_INFO_LOGGED
+    if _CV_INFO_LOGGED:
+        return
+    logger.info(
+        'OpenCV %s (optimized=%s, threads=%s)',
+        cv2.__version__,
+        cv2.useOptimized(),
+        cv2.getNumThreads(),
+    )
+    for line in cv2.getBuildInformation().splitlines():
+        line = line.strip()
+        if line.startswith(('Baseline:', 'Dispatched code generation:')):
+            logger.info('OpenCV SIMD %s', ' '.join(line.split()))
+    _CV_INFO_LOGGED = True
+
+
+def _cached_by_stamp(key: str, stamp: Hashable, loader: Callable[[], Any]) -> Any:
+    hit = _MODEL_CACHE.get(key)
+    if hit is not None and hit[0] == stamp:
+        return hit[1]
+    value = loader()
+    _MODEL_CACHE[key] = (stamp, value)
+    return value
+
+
+def _cached_by_mtime(key: str, path: Path, loader: Callable[[], Any]) -> Any:
+    return _cached_by_stamp(key, path.stat().st_mtime_ns, loader)
+
+
+def _load_recognizer():
+    # Keep parameters aligned with scripts/02_train_model.py.
+    recognizer = cv2.face.LBPHFaceRecognizer_create(radius=2, neighbors=8, grid_x=8, grid_y=8)
+    try:
+        recognizer.read(str(MODEL_PATH))
+    except cv2.error as exc:
+        raise RuntimeError(
+            'Failed to load the recognition model.\n'
+            f'Path: {MODEL_PATH}\n'
+            'Try retraining the model ("Train Recognition Model") and ensure the file is not empty.'
+        ) from exc
+    return recognizer
+
+
+def _get_recognizer():
+    return _cached_by_mtime('recognizer', MODEL_PATH, _load_recognizer)
+
+
+def _cascade_missing_error() -> FileNotFoundError:
+    return FileNotFoundError(
+        'Face cascade classifier is missing. Expected at: '
+        f'{CASCADE_PATH}\n\n'
+        'If you are running the packaged .exe, ensure the assets folder is bundled correctly.'
+    )
+
+
+def _get_cascade():
+    if not CASCADE_PATH.exists():
+        raise _cascade_missing_error()
+    return _cached_by_mtime(
+        'cascade', CASCADE_PATH, lambda: cv2.CascadeClassifier(str(CASCADE_PATH))
+    )
+
+
+def _load_dnn_detector():
+    if cv2.cuda.getCudaEnabledDeviceCount() > 0:
+        backend, target = cv2.dnn.DNN_BACKEND_CUDA, cv2.dnn.DNN_TARGET_CUDA_FP16
+    else:
+        backend, target = cv2.dnn.DNN_BACKEND_DEFAULT, cv2.dnn.DNN_TARGET_CPU
+    return cv2.FaceDetectorYN.create(
+        str(DNN_DETECTOR_PATH), '', (320, 240), DNN_SCORE_THRESHOLD, 0.3, 5000, backend, target
+    )
+
+
+def _get_face_detector():
+    """YuNet DNN detector (CUDA FP16 when available) if bundled, else the Haar cascade.
+
+    Enrollment (scripts/01_create_dataset.py) always crops with the Haar cascade and YuNet
+    boxes are framed differently, so LBPH distances run somewhat higher with YuNet (see the
+    README note). The cascade fallback raises the usual missing-asset error if it is absent.
+    """
+
+    if DNN_DETECTOR_PATH.exists():
+        try:
+            return _cached_by_mtime('dnn_detector', DNN_DETECTOR_PATH, _load_dnn_detector)
+        except cv2.error:
+            logging.getLogger(__name__).exception(
+                'Failed to load DNN face detector; falling back to Haar cascade'
+            )
+    return _get_cascade()
+
+
+def _get_user_map() -> FaceMap:
+    # The id -> name map follows both the labels the model was trained on and the users
+    # table, which can change without a retrain (renames, deletes, other processes).
+    stamp = (MODEL_PATH.stat().st_mtime_ns, _STORAGE.change_count('users'))
+    return _cached_by_stamp('user_map', stamp, load_user_details)
+
+
 def load_user_records(raise_if_missing: bool = False) -> pd.DataFrame:
     df = _STORAGE.users_df()
     if df.empty and raise_if_missing:
         raise FileNotFoundError('No users found. Enroll at least one user first.')
-    return df.reindex(columns=USER_COLUMNS).copy()
+    return df.reindex(columns=USER_COLUMNS)
 
 
 def load_user_details() -> FaceMap:
     df = load_user_records(raise_if_missing=True)
     if df.empty:
         raise ValueError('No valid numeric user IDs found. Recreate your users.')
-    ids = df['Id'].tolist()
-    names = df['Name'].tolist()
+    ids = df['Id'].to_numpy().tolist()
+    names = df['Name'].to_numpy().tolist()
     return cast(FaceMap, dict(zip(ids, names)))
 
 
+def data_stamp() -> tuple[int, int]:
+    """Changes whenever users, attendance or requests are written; see Storage.change_stamp."""
+    return _STORAGE.change_stamp()
+
+
 def load_attendance() -> pd.DataFrame:
+    """All attendance rows, ordered by Date, Time (oldest first)."""
     df = _STORAGE.attendance_df()
     columns = ['Id', 'Name', 'Date', 'Time']
     if df is None or getattr(df, 'empty', True):
@@ -71,10 +310,11 @@ def load_attendance() -> pd.DataFrame:
     return df.reindex(columns=columns, fill_value='')
 
 
-def _persist_attendance(df: pd.DataFrame) -> None:
-    # CSV is no longer the primary store; keep a best-effort export for compatibility.
+def _persist_attendance() -> None:
+    # CSV is no longer the primary store; keep a best-effort full snapshot for compatibility
+    # (migrate_from_csv_if_needed still reads it). Streamed from SQLite once per session.
     try:
-        df.to_csv(ATTENDANCE_FILE, index=False)
+        _STORAGE.export_attendance_csv(ATTENDANCE_FILE, period='all')
     except Exception:
         pass
 
@@ -104,16 +344,39 @@ def log_attendance_entry(
     attendance_df: pd.DataFrame,
     *,
     min_minutes_between_logs: int = 10,
+    logged_today: set[tuple[int, str]] | None = None,
 ) -> Tuple[pd.DataFrame, bool, str]:
+    """Log one attendance entry and return (attendance_df, logged, time_str).
+
+    `logged_today` is an optional session-local set of (user_id, date) pairs already
+    logged; a hit skips the SQLite round trip since one log per day is enforced anyway.
+    """
+
+    if logged_today is not None:
+        now = datetime.now()
+        if (int(user_id), now.strftime('%Y-%m-%d')) in logged_today:
+            return attendance_df, False, now.strftime('%H:%M:%S')
+
     result = _STORAGE.log_attendance(
         user_id=user_id,
         user_name=user_name,
         min_minutes_between_logs=int(min_minutes_between_logs),
         enforce_one_per_day=True,
     )
-    updated = load_attendance()
-    _persist_attendance(updated)
-    return updated, result.logged, result.time_str
+    if not result.logged:
+        return attendance_df, False, result.time_str
+    if logged_today is not None:
+        logged_today.add((int(user_id), result.date_str))
+
+    # The row was just inserted; append it in memory instead of reloading the whole log.
+    new_row = pd.DataFrame(
+        [[int(user_id), str(user_name), result.date_str, result.time_str]],
+        columns=['Id', 'Name', 'Date', 'Time'],
+    )
+    if attendance_df.empty:
+        return new_row, True, result.time_str
+    updated = pd.concat([attendance_df, new_row], ignore_index=True)
+    return updated, True, result.time_str
 
 
 def run_recognition(
@@ -141,12 +404,9 @@ def run_recognition(
         min_confidence,
         min_minutes_between_logs,
     )
-    if not CASCADE_PATH.exists():
-        raise FileNotFoundError(
-            'Face cascade classifier is missing. Expected at: '
-            f'{CASCADE_PATH}\n\n'
-            'If you are running the packaged .exe, ensure the assets folder is bundled correctly.'
-        )
+    _log_cv_info(logger)
+    if not CASCADE_PATH.exists() and not DNN_DETECTOR_PATH.exists():
+        raise _cascade_missing_error()
 
     if not MODEL_PATH.exists():
         raise FileNotFoundError(
@@ -157,26 +417,28 @@ def run_recognition(
             '- Or run: FaceAttendance.exe train-model'
         )
 
-    user_map = load_user_details()
+    user_map = _get_user_map()
     attendance_df = load_attendance()
-
-    # Keep parameters aligned with scripts/02_train_model.py.
-    recognizer = cv2.face.LBPHFaceRecognizer_create(radius=2, neighbors=8, grid_x=8, grid_y=8)
-    try:
-        recognizer.read(str(MODEL_PATH))
-    except cv2.error as exc:
-        raise RuntimeError(
-            'Failed to load the recognition model.\n'
-            f'Path: {MODEL_PATH}\n'
-            'Try retraining the model ("Train Recognition Model") and ensure the file is not empty.'
-        ) from exc
-    face_cascade = cv2.CascadeClassifier(str(CASCADE_PATH))
+    session_start_rows = len(attendance_df)
+    today = datetime.now().strftime('%Y-%m-%d')
+    todays_ids = attendance_df.loc[attendance_df['Date'] == today, 'Id']
+    logged_today = {(int(user_id), today) for user_id in todays_ids.to_numpy().tolist()}
+    recognizer = _get_recognizer()
+    face_detector = _get_face_detector()
+    logger.info('Face detector: %s', type(face_detector).__name__)
+    use_opencl = cv2.ocl.haveOpenCL()
+    cv2.ocl.setUseOpenCL(use_opencl)
+    logger.info('OpenCL (T-API) frame pipeline: %s', 'enabled' if use_opencl else 'unavailable')
 
     cam = cv2.VideoCapture(camera_index)
     cam.set(3, 640)
     cam.set(4, 480)
+    # Ask for single-channel frames so the per-frame BGR->GRAY pass can be skipped.
+    # Most webcams ignore this and keep delivering BGR; _to_gray handles both.
+    if cam.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'GREY')):
+        logger.info('Camera accepted GREY pixel format')
 
-    start_time = datetime.now()
+    start_time = time.monotonic()
     last_activity_time = start_time
     last_status_msg = 'Camera online. Press ESC or Q in the OpenCV window to stop early.'
 
@@ -194,46 +456,66 @@ def run_recognition(
 
     successful_log = False
     # Smooth out per-frame jitter: require N consistent matches in the last M frames.
-    recent_matches: deque[int] = deque(maxlen=max(1, stable_window))
-    recent_distances: dict[int, deque[float]] = {}
+    recent_votes = _RollingVotes(stable_window)
+    # Reused resize target for every face ROI; LBPH predict() does not keep a reference.
+    face_buf = np.empty((FACE_SIZE[1], FACE_SIZE[0]), dtype=np.uint8)
+    predict = recognizer.predict
+    frame_idx = 0
+    faces = np.empty((0, 4), dtype=int)
+    prev_thumb = None
+    # (label, distance) per box of the last processed frame, reused on static frames.
+    predictions: list[tuple[int, float]] = []
+    static_frames = 0
 
     try:
-        while (datetime.now() - start_time).total_seconds() < session_seconds:
+        while time.monotonic() - start_time < session_seconds:
             ret, frame = cam.read()
             if not ret:
                 emit_status('Camera feed unavailable. Exiting...')
                 logger.warning('Camera feed unavailable')
                 break
 
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            enhanced = CLAHE.apply(gray)
-            faces = face_cascade.detectMultiScale(
-                enhanced, scaleFactor=1.1, minNeighbors=6, minSize=(80, 80)
+            gray = _to_gray(frame, use_opencl)
+            thumb = cv2.resize(gray, STATIC_THUMB_SIZE, interpolation=cv2.INTER_AREA)
+            is_static = (
+                prev_thumb is not None
+                and len(predictions) == len(faces)
+                and static_frames < STATIC_REUSE_MAX
+                and cv2.mean(cv2.absdiff(thumb, prev_thumb))[0] < STATIC_DIFF_THRESHOLD
             )
+            if is_static:
+                static_frames += 1
+            else:
+                static_frames = 0
+                prev_thumb = thumb
+                predictions = []
+                enhanced = CLAHE.apply(gray)
+                if frame_idx % DETECT_EVERY == 0:
+                    faces = _detect_faces(face_detector, enhanced, frame)
+                frame_idx += 1
+                if isinstance(enhanced, cv2.UMat) and len(faces):
+                    enhanced = enhanced.get()
+
+            for i, (x, y, w, h) in enumerate(faces):
+                if is_static:
+                    label, raw_conf_f = predictions[i]
+                else:
+                    cv2.resize(enhanced[y : y + h, x : x + w], FACE_SIZE, dst=face_buf)
+                    label, raw_conf = predict(face_buf)
+                    raw_conf_f = float(raw_conf)
+                    predictions.append((label, raw_conf_f))
 
-            for x, y, w, h in faces:
-                roi = enhanced[y : y + h, x : x + w]
-                roi = cv2.resize(roi, FACE_SIZE)
-                label, raw_conf = recognizer.predict(roi)
-                raw_conf_f = float(raw_conf)
-                match_quality = _lbph_match_quality(raw_conf_f, min_confidence)
-
-                # Track only plausible labels to stabilize decisions.
-                if label in user_map:
-                    recent_matches.append(label)
-                    if label not in recent_distances:
-                        recent_distances[label] = deque(maxlen=max(1, stable_window))
-                    recent_distances[label].append(raw_conf_f)
+                    # Track only plausible labels to stabilize decisions.
+                    if label in user_map:
+                        recent_votes.push(label, raw_conf_f)
 
                 stable_label: int | None = None
                 stable_distance: float | None = None
-                if stable_frames > 1 and len(recent_matches) >= stable_frames:
-                    label_counts = Counter(recent_matches)
-                    candidate, count = label_counts.most_common(1)[0]
-                    if count >= stable_frames:
-                        distances = list(recent_distances.get(candidate, []))
-                        if distances:
-                            avg_dist = sum(distances) / len(distances)
+                if stable_frames > 1 and len(recent_votes) >= stable_frames:
+                    candidate, count = recent_votes.leader()
+                    if candidate is not None and count >= stable_frames:
+                        avg_dist = recent_votes.mean_distance(candidate)
+                        if avg_dist is not None:
                             stable_label = candidate
                             stable_distance = avg_dist
 
@@ -246,6 +528,7 @@ def run_recognition(
                         user_map[effective_label],
                         attendance_df,
                         min_minutes_between_logs=min_minutes_between_logs,
+                        logged_today=logged_today,
                     )
                     if logged:
                         logger.info(
@@ -257,8 +540,9 @@ def run_recognition(
                     if logged:
                         emit_log(user_map[effective_label], time_str)
                         emit_status(f'Logged {user_map[effective_label]} @ {time_str}')
-                        last_activity_time = datetime.now()
+                        last_activity_time = time.monotonic()
                         successful_log = True
+                        prev_thumb = None
                         if stop_on_success:
                             break
                     else:
@@ -275,6 +559,7 @@ def run_recognition(
                         emit_status('Unknown face — enroll first or adjust lighting.')
 
                 if display_window:
+                    match_quality = _lbph_match_quality(raw_conf_f, min_confidence)
                     cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
                     cv2.putText(
                         frame,
@@ -296,8 +581,12 @@ def run_recognition(
                         2,
                     )
 
+            if successful_log and stop_on_success:
+                emit_status('Attendance logged. Closing camera...')
+                break
+
             if display_window:
-                idle_seconds = (datetime.now() - last_activity_time).total_seconds()
+                idle_seconds = time.monotonic() - last_activity_time
                 if (
                     idle_hint_seconds > 0
                     and idle_seconds > idle_hint_seconds
@@ -336,16 +625,14 @@ def run_recognition(
                 )
 
                 cv2.imshow('Attendance Camera', frame)
-                key = cv2.waitKey(10) & 0xFF
+                key = cv2.waitKey(1) & 0xFF
                 if key in (27, ord('q'), ord('Q')):
                     emit_status('Capture stopped by user input.')
                     break
-
-            if successful_log and stop_on_success:
-                emit_status('Attendance logged. Closing camera...')
-                break
     finally:
         cam.release()
+        if len(attendance_df) > session_start_rows:
+            _persist_attendance()
         if display_window:
             cv2.destroyAllWindows()
         if successful_log:
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
 from backend.storage import Storage
@@ -20,10 +21,10 @@ def _normalize(df: pd.DataFrame) -> pd.DataFrame:
         df['RequestId'] = pd.to_numeric(df['RequestId'], errors='coerce')
         max_id = df['RequestId'].dropna().max()
         max_id = 0 if pd.isna(max_id) else int(max_id)
-        next_id = max_id + 1
-        for idx in df[df['RequestId'].isna()].index:
-            df.at[idx, 'RequestId'] = next_id
-            next_id += 1
+        missing = df['RequestId'].isna()
+        n_missing = int(missing.sum())
+        if n_missing:
+            df.loc[missing, 'RequestId'] = np.arange(max_id + 1, max_id + 1 + n_missing)
         df['RequestId'] = df['RequestId'].astype(int)
     return df
 
@@ -33,6 +34,10 @@ def load_requests() -> pd.DataFrame:
     return _normalize(df)
 
 
+def count_pending_requests() -> int:
+    return _STORAGE.pending_request_count()
+
+
 def save_requests(df: pd.DataFrame) -> None:
     # Requests are stored in SQLite; CSV is not the source of truth.
     return
@@ -5,6 +5,7 @@
 -- - The live schema is created in backend/storage.py (kept in sync with this file).
 
 PRAGMA foreign_keys = ON;
+PRAGMA journal_mode = WAL;
 
 CREATE TABLE IF NOT EXISTS users (
     id   INTEGER PRIMARY KEY,
@@ -12,17 +13,17 @@ CREATE TABLE IF NOT EXISTS users (
 );
 
 CREATE TABLE IF NOT EXISTS attendance (
-    id      INTEGER PRIMARY KEY AUTOINCREMENT,
-    user_id INTEGER NOT NULL,
-    name    TEXT NOT NULL,
-    ts      TEXT NOT NULL,
-    date    TEXT NOT NULL,
-    time    TEXT NOT NULL
+    id       INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id  INTEGER NOT NULL,
+    name     TEXT NOT NULL,
+    -- Whole seconds since 1970-01-01 with local wall time read as UTC; date/time are
+    -- derived on read via date(ts_epoch, 'unixepoch') / time(ts_epoch, 'unixepoch').
+    ts_epoch INTEGER NOT NULL
 );
 
-CREATE INDEX IF NOT EXISTS idx_attendance_user_date ON attendance(user_id, date);
-CREATE INDEX IF NOT EXISTS idx_attendance_ts ON attendance(ts);
-CREATE UNIQUE INDEX IF NOT EXISTS uniq_attendance_user_ts ON attendance(user_id, ts);
+-- Serves the per-user day/rate-limit checks in the attendance insert from the index.
+CREATE UNIQUE INDEX IF NOT EXISTS uniq_attendance_user_ts ON attendance(user_id, ts_epoch);
+CREATE INDEX IF NOT EXISTS idx_attendance_ts_epoch ON attendance(ts_epoch);
 
 CREATE TABLE IF NOT EXISTS enrollment_requests (
     request_id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -32,3 +33,47 @@ CREATE TABLE IF NOT EXISTS enrollment_requests (
     timestamp  TEXT NOT NULL,
     status     TEXT NOT NULL
 );
+
+-- Small key/value flags (e.g. csv_migrated) so startup checks avoid scanning big tables.
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+
+-- Per-table change counters, bumped by the triggers below on every insert/update/delete
+-- from any connection. Storage keys its DataFrame cache on them.
+CREATE TABLE IF NOT EXISTS table_changes (
+    tbl TEXT PRIMARY KEY,
+    n   INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO table_changes(tbl) VALUES ('users'), ('attendance'), ('enrollment_requests');
+CREATE TRIGGER IF NOT EXISTS users_insert_changed AFTER INSERT ON users BEGIN
+    UPDATE table_changes SET n = n + 1 WHERE tbl = 'users';
+END;
+CREATE TRIGGER IF NOT EXISTS users_update_changed AFTER UPDATE ON users BEGIN
+    UPDATE table_changes SET n = n + 1 WHERE tbl = 'users';
+END;
+CREATE TRIGGER IF NOT EXISTS users_delete_changed AFTER DELETE ON users BEGIN
+    UPDATE table_changes SET n = n + 1 WHERE tbl = 'users';
+END;
+CREATE TRIGGER IF NOT EXISTS attendance_insert_changed AFTER INSERT ON attendance BEGIN
+    UPDATE table_changes SET n = n + 1 WHERE tbl = 'attendance';
+END;
+CREATE TRIGGER IF NOT EXISTS attendance_update_changed AFTER UPDATE ON attendance BEGIN
+    UPDATE table_changes SET n = n + 1 WHERE tbl = 'attendance';
+END;
+CREATE TRIGGER IF NOT EXISTS attendance_delete_changed AFTER DELETE ON attendance BEGIN
+    UPDATE table_changes SET n = n + 1 WHERE tbl = 'attendance';
+END;
+CREATE TRIGGER IF NOT EXISTS enrollment_requests_insert_changed AFTER INSERT ON enrollment_requests BEGIN
+    UPDATE table_changes SET n = n + 1 WHERE tbl = 'enrollment_requests';
+END;
+CREATE TRIGGER IF NOT EXISTS enrollment_requests_update_changed AFTER UPDATE ON enrollment_requests BEGIN
+    UPDATE table_changes SET n = n + 1 WHERE tbl = 'enrollment_requests';
+END;
+CREATE TRIGGER IF NOT EXISTS enrollment_requests_delete_changed AFTER DELETE ON enrollment_requests BEGIN
+    UPDATE table_changes SET n = n + 1 WHERE tbl = 'enrollment_requests';
+END;
+
+-- Matches storage.SCHEMA_VERSION; Storage skips the DDL when the DB is already at it.
+PRAGMA user_version = 3;
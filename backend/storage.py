@@ -1,39 +1,192 @@
 from __future__ import annotations
 
+import csv
+import logging
+import queue
 import sqlite3
+import threading
+from contextlib import contextmanager
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, Tuple
-
-import pandas as pd
+from typing import TYPE_CHECKING, Callable, Iterator, Optional
 
 from shared.paths import data_dir
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 DEFAULT_DB_PATH = data_dir() / "attendance.sqlite3"
+_EPOCH = datetime(1970, 1, 1)
+# Upper bound on concurrently checked-out connections per Storage (capture thread, Tk
+# thread, dialogs); idle connections are kept open so SQLite's page cache stays warm.
+POOL_SIZE = 4
+# Stored in PRAGMA user_version; bump whenever _ensure_schema gains tables, columns or indexes.
+SCHEMA_VERSION = 3
+# Rows per chunk when streaming the legacy attendance CSV into SQLite.
+IMPORT_CHUNK_ROWS = 65536
+# Per-connection prepared-statement cache (sqlite3 default is 128); the hot-path SQL below
+# is kept in module constants so every call hits the same cached entry.
+STATEMENT_CACHE_SIZE = 256
+
+_SQL_UPSERT_USER = (
+    "INSERT INTO users(id, name) VALUES(?, ?) ON CONFLICT(id) DO UPDATE SET name=excluded.name"
+)
+# Duplicate check and insert in one statement/transaction (no check-then-insert race).
+# ?4 enforces one log per calendar day [?5, ?5 + 1 day); ?6 enforces the ?7 cutoff.
+_SQL_INSERT_ATTENDANCE = (
+    "INSERT OR IGNORE INTO attendance(user_id, name, ts_epoch) "
+    "SELECT ?1, ?2, ?3 WHERE NOT EXISTS ("
+    "SELECT 1 FROM attendance WHERE user_id = ?1 "
+    "AND ((?4 AND ts_epoch >= ?5 AND ts_epoch < ?5 + 86400) OR (?6 AND ts_epoch > ?7)))"
+)
+# Legacy import: ts_epoch is parsed in pandas first; duplicates are skipped by
+# uniq_attendance_user_ts.
+_SQL_IMPORT_ATTENDANCE = "INSERT OR IGNORE INTO attendance(user_id, name, ts_epoch) VALUES(?, ?, ?)"
+_SQL_INSERT_REQUEST = (
+    "INSERT INTO enrollment_requests(name, contact, message, timestamp, status) "
+    "VALUES(?, ?, ?, ?, ?)"
+)
+# Every committed insert/update/delete bumps its table's counter (see _ensure_schema),
+# whichever process or Storage instance made it; the reader cache is keyed on it.
+_TRACKED_TABLES = ("users", "attendance", "enrollment_requests")
+_SQL_CHANGE_COUNT = "SELECT n FROM table_changes WHERE tbl = ?"
+_SQL_COUNT_PENDING = (
+    "SELECT COUNT(*) FROM enrollment_requests WHERE instr(lower(status), 'pending') > 0"
+)
+
+# Column dtypes for the DataFrame readers (the SELECTs alias columns to these names).
+_USERS_DTYPES = {"Id": "int64", "Name": "string"}
+# Low-cardinality text (a name repeated on every log row, a handful of statuses) is
+# stored as category: one copy per distinct value plus small integer codes.
+_ATTENDANCE_DTYPES = {"Id": "int64", "Name": "category", "Date": "string", "Time": "string"}
+_REQUESTS_DTYPES = {
+    "RequestId": "int64",
+    "Name": "string",
+    "Contact": "string",
+    "Message": "string",
+    "Timestamp": "string",
+    "Status": "category",
+}
+
+# Text columns of the legacy CSVs are read as plain strings (no type inference, no NaN);
+# numeric ids are left to the C parser's integer fast path.
+_USERS_CSV_DTYPES = {"Name": str}
+_ATTENDANCE_CSV_DTYPES = {"Name": str, "Date": str, "Time": str}
+_REQUESTS_CSV_DTYPES = {
+    "Name": str,
+    "Contact": str,
+    "Message": str,
+    "Timestamp": str,
+    "Status": str,
+}
 
 
 @dataclass(frozen=True)
 class AttendanceLogResult:
     logged: bool
     time_str: str
+    date_str: str = ""
 
 
 class Storage:
     def __init__(self, db_path: Path = DEFAULT_DB_PATH):
         self.db_path = db_path
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._pool: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(POOL_SIZE)
+        # Reader cache: table -> (change counter, DataFrame).
+        self._df_cache: dict[str, tuple[int, pd.DataFrame]] = {}
         self._ensure_schema()
 
     def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(str(self.db_path))
+        conn = sqlite3.connect(
+            str(self.db_path), check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE
+        )
         conn.execute("PRAGMA foreign_keys = ON")
-        conn.row_factory = sqlite3.Row
+        # WAL (set once in _ensure_schema, persistent) + NORMAL sync: no fsync per commit,
+        # and readers (dashboard) don't block the capture loop's writes.
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA mmap_size = 268435456")
+        conn.execute("PRAGMA cache_size = -20000")
+        conn.execute("PRAGMA busy_timeout = 5000")
         return conn
 
+    @contextmanager
+    def _conn(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a pooled connection; commits on success, rolls back on error."""
+
+        with self._slots:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+            try:
+                with conn:
+                    yield conn
+            finally:
+                self._pool.put(conn)
+
+    def close(self) -> None:
+        """Close all idle pooled connections."""
+
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def _cached_df(
+        self,
+        table: str,
+        sql: str,
+        dtype: dict[str, str],
+        sort_by: Optional[list[str]] = None,
+    ) -> pd.DataFrame:
+        with self._conn() as conn:
+            key = conn.execute(_SQL_CHANGE_COUNT, (table,)).fetchone()[0]
+            hit = self._df_cache.get(table)
+            if hit is not None and hit[0] == key:
+                return hit[1].copy(deep=False)
+            import pandas as pd
+
+            # Explicit dtypes: strings land in StringDtype arrays instead of being inferred.
+            df = pd.read_sql_query(sql, conn, dtype=dtype, coerce_float=False)
+        if sort_by:
+            df = df.sort_values(sort_by, kind="stable", ignore_index=True)
+        self._df_cache[table] = (key, df)
+        return df.copy(deep=False)
+
+    def change_stamp(self) -> tuple[int, int]:
+        """Cheap on-disk change marker: mtimes of the DB file and its WAL (0 if missing).
+
+        Any committed write from any process bumps one of them, so callers can skip
+        re-reading when the stamp is unchanged.
+        """
+
+        wal_path = self.db_path.with_name(self.db_path.name + "-wal")
+        return _mtime_ns(self.db_path), _mtime_ns(wal_path)
+
+    def change_count(self, table: str) -> int:
+        """Trigger-maintained write counter for one tracked table, shared by all processes."""
+
+        with self._conn() as conn:
+            return conn.execute(_SQL_CHANGE_COUNT, (table,)).fetchone()[0]
+
+    def checkpoint(self) -> None:
+        """Fold the WAL back into the main DB file without blocking writers."""
+        with self._conn() as conn:
+            conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
     def _ensure_schema(self) -> None:
-        with self._connect() as conn:
+        with self._conn() as conn:
+            # Existing, up-to-date databases skip the DDL entirely.
+            if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+                return
+            if self.db_path.name != ":memory:":
+                conn.execute("PRAGMA journal_mode = WAL")
             conn.executescript(
                 """
                 CREATE TABLE IF NOT EXISTS users (
@@ -45,15 +198,9 @@ class Storage:
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     user_id INTEGER NOT NULL,
                     name TEXT NOT NULL,
-                    ts TEXT NOT NULL,
-                    date TEXT NOT NULL,
-                    time TEXT NOT NULL
+                    ts_epoch INTEGER NOT NULL
                 );
 
-                CREATE INDEX IF NOT EXISTS idx_attendance_user_date ON attendance(user_id, date);
-                CREATE INDEX IF NOT EXISTS idx_attendance_ts ON attendance(ts);
-                CREATE UNIQUE INDEX IF NOT EXISTS uniq_attendance_user_ts ON attendance(user_id, ts);
-
                 CREATE TABLE IF NOT EXISTS enrollment_requests (
                     request_id INTEGER PRIMARY KEY AUTOINCREMENT,
                     name TEXT NOT NULL,
@@ -62,28 +209,79 @@ class Storage:
                     timestamp TEXT NOT NULL,
                     status TEXT NOT NULL
                 );
+
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+
+                CREATE TABLE IF NOT EXISTS table_changes (
+                    tbl TEXT PRIMARY KEY,
+                    n INTEGER NOT NULL DEFAULT 0
+                );
                 """
             )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(attendance)")}
+            if "ts" in columns:
+                # Older layout kept ts/date/time as TEXT next to each row; rebuild the table
+                # with just ts_epoch (date/time are derived on read). Indexes go with it.
+                conn.execute(
+                    "CREATE TABLE attendance_v2 ("
+                    "id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER NOT NULL, "
+                    "name TEXT NOT NULL, ts_epoch INTEGER NOT NULL)"
+                )
+                _copy_legacy_attendance(conn)
+                conn.execute("DROP TABLE attendance")
+                conn.execute("ALTER TABLE attendance_v2 RENAME TO attendance")
+            # One index serves the per-user day/rate-limit checks in _SQL_INSERT_ATTENDANCE.
+            conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS uniq_attendance_user_ts "
+                "ON attendance(user_id, ts_epoch)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_attendance_ts_epoch ON attendance(ts_epoch)"
+            )
+            # Created after the rebuild above, which would drop triggers on the old table.
+            for table in _TRACKED_TABLES:
+                conn.execute("INSERT OR IGNORE INTO table_changes(tbl) VALUES (?)", (table,))
+                for event in ("INSERT", "UPDATE", "DELETE"):
+                    conn.execute(
+                        f"CREATE TRIGGER IF NOT EXISTS {table}_{event.lower()}_changed "
+                        f"AFTER {event} ON {table} BEGIN "
+                        f"UPDATE table_changes SET n = n + 1 WHERE tbl = '{table}'; END"
+                    )
+            if "ts" in columns:
+                # Refresh planner statistics for the rebuilt table.
+                conn.execute("ANALYZE")
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
 
     # ---------- Users ----------
 
     def users_df(self) -> pd.DataFrame:
-        with self._connect() as conn:
-            return pd.read_sql_query("SELECT id AS Id, name AS Name FROM users ORDER BY id", conn)
+        return self._cached_df(
+            "users",
+            "SELECT id AS Id, name AS Name FROM users ORDER BY id",
+            _USERS_DTYPES,
+        )
+
+    def export_users_csv(self, out_path: Path) -> None:
+        # Plain csv keeps callers like the enrollment script from importing pandas.
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._conn() as conn, out_path.open("w", newline="", encoding="utf-8") as fh:
+            cur = conn.execute("SELECT id, name FROM users ORDER BY id")
+            writer = csv.writer(fh)
+            writer.writerow(["Id", "Name"])
+            writer.writerows(cur)
 
     def upsert_user(self, user_id: int, name: str) -> None:
         name = (name or "").strip()
         if not name:
             raise ValueError("Name cannot be empty")
-        with self._connect() as conn:
-            conn.execute(
-                "INSERT INTO users(id, name) VALUES(?, ?) "
-                "ON CONFLICT(id) DO UPDATE SET name=excluded.name",
-                (int(user_id), name),
-            )
+        with self._conn() as conn:
+            conn.execute(_SQL_UPSERT_USER, (int(user_id), name))
 
     def delete_user(self, user_id: int) -> None:
-        with self._connect() as conn:
+        with self._conn() as conn:
             cur = conn.execute("DELETE FROM users WHERE id=?", (int(user_id),))
             if cur.rowcount == 0:
                 raise ValueError(f"User ID {user_id} not found")
@@ -91,22 +289,13 @@ class Storage:
     # ---------- Attendance ----------
 
     def attendance_df(self) -> pd.DataFrame:
-        with self._connect() as conn:
-            return pd.read_sql_query(
-                "SELECT user_id AS Id, name AS Name, date AS Date, time AS Time "
-                "FROM attendance ORDER BY date, time",
-                conn,
-            )
-
-    def _last_log_for_user(self, user_id: int) -> Optional[Tuple[str, str]]:
-        with self._connect() as conn:
-            row = conn.execute(
-                "SELECT ts, date FROM attendance WHERE user_id=? ORDER BY ts DESC LIMIT 1",
-                (int(user_id),),
-            ).fetchone()
-            if not row:
-                return None
-            return str(row["ts"]), str(row["date"])
+        return self._cached_df(
+            "attendance",
+            "SELECT user_id AS Id, name AS Name, date(ts_epoch, 'unixepoch') AS Date, "
+            "time(ts_epoch, 'unixepoch') AS Time FROM attendance",
+            _ATTENDANCE_DTYPES,
+            sort_by=["Date", "Time"],
+        )
 
     def log_attendance(
         self,
@@ -118,32 +307,29 @@ class Storage:
         now: Optional[datetime] = None,
     ) -> AttendanceLogResult:
         now_dt = now or datetime.now()
-        date_str = now_dt.strftime("%Y-%m-%d")
-        time_str = now_dt.strftime("%H:%M:%S")
-        ts_iso = now_dt.strftime("%Y-%m-%d %H:%M:%S")
-
-        last = self._last_log_for_user(user_id)
-        if last:
-            last_ts, last_date = last
-            if enforce_one_per_day and last_date == date_str:
-                return AttendanceLogResult(logged=False, time_str=time_str)
-
-            if min_minutes_between_logs > 0:
-                try:
-                    last_dt = datetime.strptime(last_ts, "%Y-%m-%d %H:%M:%S")
-                    delta_min = (now_dt - last_dt).total_seconds() / 60.0
-                    if delta_min < float(min_minutes_between_logs):
-                        return AttendanceLogResult(logged=False, time_str=time_str)
-                except Exception:
-                    # If parsing fails, fall back to allowing the log.
-                    pass
-
-        with self._connect() as conn:
-            conn.execute(
-                "INSERT INTO attendance(user_id, name, ts, date, time) VALUES(?, ?, ?, ?, ?)",
-                (int(user_id), str(user_name), ts_iso, date_str, time_str),
+        ts_iso = now_dt.isoformat(sep=" ", timespec="seconds")
+        date_str, time_str = ts_iso.split(" ")
+        epoch = _wall_epoch(now_dt)
+
+        day_start = epoch - epoch % 86400
+        rate_limited = min_minutes_between_logs > 0
+        cutoff = epoch - max(0, min_minutes_between_logs) * 60
+
+        with self._conn() as conn:
+            cur = conn.execute(
+                _SQL_INSERT_ATTENDANCE,
+                (
+                    int(user_id),
+                    str(user_name),
+                    epoch,
+                    int(enforce_one_per_day),
+                    day_start,
+                    int(rate_limited),
+                    cutoff,
+                ),
             )
-        return AttendanceLogResult(logged=True, time_str=time_str)
+            logged = cur.rowcount == 1
+        return AttendanceLogResult(logged=logged, time_str=time_str, date_str=date_str)
 
     def export_attendance_csv(
         self, out_path: Path, *, period: str = "daily", now: Optional[datetime] = None
@@ -151,41 +337,34 @@ class Storage:
         now_dt = now or datetime.now()
         period = (period or "daily").strip().lower()
 
-        if period == "daily":
-            start = now_dt.replace(hour=0, minute=0, second=0, microsecond=0)
-        elif period == "weekly":
-            # Monday as start of week
-            start = now_dt.replace(hour=0, minute=0, second=0, microsecond=0) - pd.Timedelta(
-                days=int(now_dt.weekday())
-            )
-            start = start.to_pydatetime()
-        elif period == "monthly":
-            start = now_dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        else:
-            raise ValueError("period must be one of: daily, weekly, monthly")
-
-        start_iso = start.strftime("%Y-%m-%d %H:%M:%S")
-        with self._connect() as conn:
-            df = pd.read_sql_query(
-                "SELECT user_id AS Id, name AS Name, date AS Date, time AS Time "
-                "FROM attendance WHERE ts >= ? ORDER BY ts",
-                conn,
-                params=(start_iso,),
-            )
+        period_start = _PERIOD_START.get(period)
+        if period_start is None:
+            raise ValueError("period must be one of: daily, weekly, monthly, all")
+        start_epoch = _wall_epoch(period_start(now_dt))
 
         out_path.parent.mkdir(parents=True, exist_ok=True)
-        df.to_csv(out_path, index=False)
+        # Stream rows straight from the cursor so memory stays flat for long ranges.
+        with self._conn() as conn, out_path.open("w", newline="", encoding="utf-8") as fh:
+            cur = conn.execute(
+                "SELECT user_id, name, date(ts_epoch, 'unixepoch'), time(ts_epoch, 'unixepoch') "
+                "FROM attendance "
+                "WHERE ts_epoch >= ? ORDER BY ts_epoch",
+                (start_epoch,),
+            )
+            writer = csv.writer(fh)
+            writer.writerow(["Id", "Name", "Date", "Time"])
+            writer.writerows(cur)
 
     # ---------- Enrollment Requests ----------
 
     def requests_df(self) -> pd.DataFrame:
-        with self._connect() as conn:
-            return pd.read_sql_query(
-                "SELECT request_id AS RequestId, name AS Name, contact AS Contact, "
-                "message AS Message, timestamp AS Timestamp, status AS Status "
-                "FROM enrollment_requests ORDER BY request_id",
-                conn,
-            )
+        return self._cached_df(
+            "enrollment_requests",
+            "SELECT request_id AS RequestId, name AS Name, contact AS Contact, "
+            "message AS Message, timestamp AS Timestamp, status AS Status "
+            "FROM enrollment_requests ORDER BY request_id",
+            _REQUESTS_DTYPES,
+        )
 
     def add_request(self, *, name: str, contact: str, message: str) -> None:
         name = name.strip()
@@ -198,10 +377,9 @@ class Storage:
         if not message:
             raise ValueError("Please describe your request.")
 
-        with self._connect() as conn:
+        with self._conn() as conn:
             conn.execute(
-                "INSERT INTO enrollment_requests(name, contact, message, timestamp, status) "
-                "VALUES(?, ?, ?, ?, ?)",
+                _SQL_INSERT_REQUEST,
                 (
                     name,
                     contact,
@@ -211,11 +389,17 @@ class Storage:
                 ),
             )
 
+    def pending_request_count(self) -> int:
+        """Requests whose status mentions 'pending' (any case), counted in SQLite."""
+
+        with self._conn() as conn:
+            return conn.execute(_SQL_COUNT_PENDING).fetchone()[0]
+
     def update_request_status(self, request_id: int, status: str) -> None:
         status = (status or "").strip()
         if not status:
             raise ValueError("Status cannot be empty")
-        with self._connect() as conn:
+        with self._conn() as conn:
             cur = conn.execute(
                 "UPDATE enrollment_requests SET status=? WHERE request_id=?",
                 (status, int(request_id)),
@@ -232,19 +416,31 @@ class Storage:
         att_csv = data_dir() / "Attendance.csv"
         req_csv = data_dir() / "EnrollmentRequests.csv"
 
-        with self._connect() as conn:
-            user_count = conn.execute("SELECT COUNT(*) AS c FROM users").fetchone()["c"]
-            att_count = conn.execute("SELECT COUNT(*) AS c FROM attendance").fetchone()["c"]
-            req_count = conn.execute("SELECT COUNT(*) AS c FROM enrollment_requests").fetchone()[
-                "c"
-            ]
+        with self._conn() as conn:
+            # Flag lookup is a primary-key probe, so repeat startups never touch the big tables.
+            done = conn.execute("SELECT value FROM meta WHERE key = 'csv_migrated'").fetchone()
+            if done is not None and done[0] == "1":
+                return
+            user_count, att_count, req_count = conn.execute(
+                "SELECT EXISTS(SELECT 1 FROM users), EXISTS(SELECT 1 FROM attendance), "
+                "EXISTS(SELECT 1 FROM enrollment_requests)"
+            ).fetchone()
 
         if user_count == 0 or att_count == 0 or req_count == 0:
-            self.sync_from_csv(
+            summary = self.sync_from_csv(
                 users_csv=users_csv if user_count == 0 else None,
                 attendance_csv=att_csv if att_count == 0 else None,
                 requests_csv=req_csv if req_count == 0 else None,
             )
+            if summary["attendance_rejected"]:
+                logging.getLogger(__name__).warning(
+                    "Skipped %d rows of %s with unparseable Date/Time",
+                    summary["attendance_rejected"],
+                    att_csv,
+                )
+
+        with self._conn() as conn:
+            conn.execute("INSERT OR REPLACE INTO meta(key, value) VALUES('csv_migrated', '1')")
 
     def sync_from_csv(
         self,
@@ -258,30 +454,130 @@ class Storage:
         Safe to re-run for users + attendance:
         - users are upserted by id
         - attendance uses INSERT OR IGNORE keyed by (user_id, ts)
+
+        attendance_rejected counts log rows whose Date/Time could not be parsed.
         """
 
         users_csv = _default_path_if_exists(users_csv)
         attendance_csv = _default_path_if_exists(attendance_csv)
         requests_csv = _default_path_if_exists(requests_csv)
 
-        summary = {"users_upserted": 0, "attendance_inserted": 0, "requests_inserted": 0}
-
-        if users_csv:
-            summary["users_upserted"] = _upsert_users(self, _read_csv_safe(users_csv))
-
-        with self._connect() as conn:
-            if attendance_csv:
-                summary["attendance_inserted"] = _insert_attendance_rows(
-                    conn, _read_csv_safe(attendance_csv)
+        summary = {
+            "users_upserted": 0,
+            "attendance_inserted": 0,
+            "attendance_rejected": 0,
+            "requests_inserted": 0,
+        }
+
+        # One transaction for the whole import; each table is a single executemany.
+        with self._conn() as conn:
+            if users_csv:
+                summary["users_upserted"] = _upsert_users(
+                    conn, _read_csv_safe(users_csv, _USERS_CSV_DTYPES)
                 )
+            if attendance_csv:
+                # The attendance log is the one that grows large; stream it in bounded chunks.
+                for chunk in _read_csv_chunks(attendance_csv, _ATTENDANCE_CSV_DTYPES):
+                    inserted, rejected = _insert_attendance_rows(conn, chunk)
+                    summary["attendance_inserted"] += inserted
+                    summary["attendance_rejected"] += rejected
             if requests_csv:
                 summary["requests_inserted"] = _insert_request_rows(
-                    conn, _read_csv_safe(requests_csv)
+                    conn, _read_csv_safe(requests_csv, _REQUESTS_CSV_DTYPES)
                 )
 
         return summary
 
 
+def _midnight(dt: datetime) -> datetime:
+    return dt.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+# Export period -> start of that period (weeks start on Monday); "all" is the full log.
+_PERIOD_START: dict[str, Callable[[datetime], datetime]] = {
+    "daily": _midnight,
+    "weekly": lambda d: _midnight(d) - timedelta(days=d.weekday()),
+    "monthly": lambda d: _midnight(d).replace(day=1),
+    "all": lambda d: _EPOCH,
+}
+
+
+def _wall_epoch(dt: datetime) -> int:
+    """Whole seconds since 1970-01-01, treating the naive local wall time as UTC.
+
+    Round-trips with SQLite's strftime('%s', ...) and date/time(ts_epoch, 'unixepoch').
+    """
+
+    return (dt.replace(microsecond=0) - _EPOCH) // timedelta(seconds=1)
+
+
+def _parse_wall_epochs(stamps: pd.Series) -> pd.Series:
+    """Vectorized _wall_epoch for "date time" strings; <NA> where a value can't be parsed.
+
+    The app's own "%Y-%m-%d %H:%M:%S" takes the fast path. Older logs also hold hand-edited
+    or locale-formatted values ("2025-1-5 8:00:00", "05/01/2025 08:00:00") that SQLite's
+    strftime rejects, so only those are retried with pandas' per-element parser.
+    """
+
+    import pandas as pd
+
+    parsed = pd.to_datetime(stamps, format="%Y-%m-%d %H:%M:%S", errors="coerce")
+    retry = parsed.isna() & (stamps != "")
+    if retry.any():
+        parsed[retry] = pd.to_datetime(stamps[retry], format="mixed", errors="coerce")
+    return ((parsed - pd.Timestamp(_EPOCH)) // pd.Timedelta(seconds=1)).astype("Int64")
+
+
+def _copy_legacy_attendance(conn: sqlite3.Connection) -> None:
+    """Fill attendance_v2 from the pre-ts_epoch attendance table without dropping rows.
+
+    Rows whose ts still can't be parsed are moved to attendance_unparsed (with their
+    original text) rather than lost, and counted in a warning.
+    """
+
+    import pandas as pd
+
+    legacy = pd.DataFrame.from_records(
+        conn.execute("SELECT id, user_id, name, ts FROM attendance").fetchall(),
+        columns=["id", "user_id", "name", "ts"],
+    )
+    if legacy.empty:
+        return
+    epochs = _parse_wall_epochs(_str_col(legacy, "ts"))
+    ok = epochs.notna()
+    conn.executemany(
+        "INSERT INTO attendance_v2(id, user_id, name, ts_epoch) VALUES(?, ?, ?, ?)",
+        zip(
+            legacy["id"][ok].tolist(),
+            legacy["user_id"][ok].tolist(),
+            legacy["name"][ok].tolist(),
+            epochs[ok].astype("int64").tolist(),
+        ),
+    )
+    unparsed = legacy[~ok]
+    if unparsed.empty:
+        return
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS attendance_unparsed ("
+        "id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, name TEXT NOT NULL, ts TEXT)"
+    )
+    conn.executemany(
+        "INSERT OR REPLACE INTO attendance_unparsed(id, user_id, name, ts) VALUES(?, ?, ?, ?)",
+        unparsed.itertuples(index=False, name=None),
+    )
+    logging.getLogger(__name__).warning(
+        "Kept %d legacy attendance rows with unparseable timestamps in attendance_unparsed",
+        len(unparsed),
+    )
+
+
+def _mtime_ns(path: Path) -> int:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
 def users_count_safe(path: Path) -> bool:
     try:
         return path.exists() and path.stat().st_size > 0
@@ -289,134 +585,106 @@ def users_count_safe(path: Path) -> bool:
         return False
 
 
-def _read_csv_safe(path: Path) -> pd.DataFrame:
+def _read_csv_safe(path: Path, dtype: Optional[dict[str, type]] = None) -> pd.DataFrame:
+    import pandas as pd
+
     try:
-        return pd.read_csv(path)
+        return pd.read_csv(path, dtype=dtype, keep_default_na=False, engine="c")
     except Exception:
         return pd.DataFrame()
 
 
-def _as_str(value) -> str:
-    try:
-        return str(value)
-    except Exception:
-        return ""
-
+def _read_csv_chunks(
+    path: Path, dtype: Optional[dict[str, type]] = None, chunksize: int = IMPORT_CHUNK_ROWS
+) -> Iterator[pd.DataFrame]:
+    import pandas as pd
 
-def _as_int(value):
     try:
-        return int(value)
+        with pd.read_csv(
+            path, dtype=dtype, keep_default_na=False, engine="c", chunksize=chunksize
+        ) as reader:
+            yield from reader
     except Exception:
-        return None
-
-
-def _as_ts(date_str: str, time_str: str) -> str:
-    date_str = (date_str or "").strip()
-    time_str = (time_str or "").strip()
-    if not date_str or not time_str:
-        return ""
-    return f"{date_str} {time_str}"
+        return
 
 
-def _coerce_time(t: str) -> str:
-    # Keep as-is; assume HH:MM:SS.
-    return (t or "").strip()
-
-
-def _coerce_date(d: str) -> str:
-    # Keep as-is; assume YYYY-MM-DD.
-    return (d or "").strip()
-
-
-def _normalize_status(s: str) -> str:
-    s = (s or "").strip()
-    return s if s else "Pending"
-
-
-def _normalize_message(s: str) -> str:
-    return (s or "").strip()
-
-
-def _normalize_contact(s: str) -> str:
-    return (s or "").strip()
-
-
-def _normalize_name(s: str) -> str:
-    return (s or "").strip()
+def _should_import_df(df: pd.DataFrame, required: set[str]) -> bool:
+    return df is not None and not getattr(df, "empty", True) and required.issubset(set(df.columns))
 
 
-def _normalize_timestamp(s: str) -> str:
-    return (s or "").strip()
+def _str_col(df: pd.DataFrame, column: str) -> pd.Series:
+    # StringDtype keeps the strip in pandas' string kernels instead of a per-object loop.
+    return df[column].astype("string").fillna("").str.strip()
 
 
-def _should_import_df(df: pd.DataFrame, required: set[str]) -> bool:
-    return df is not None and not getattr(df, "empty", True) and required.issubset(set(df.columns))
+def _int_col(df: pd.DataFrame, column: str) -> pd.Series:
+    import pandas as pd
 
+    return pd.to_numeric(df[column], errors="coerce")
 
-def _safe_iterrows(df: pd.DataFrame):
-    try:
-        return df.iterrows()
-    except Exception:
-        return []
 
+def _insert_attendance_rows(conn: sqlite3.Connection, df: pd.DataFrame) -> tuple[int, int]:
+    """Import one CSV chunk; returns (rows inserted, rows with an unparseable Date/Time)."""
 
-def _insert_attendance_rows(conn: sqlite3.Connection, df: pd.DataFrame) -> int:
-    inserted = 0
     required = {"Id", "Name", "Date", "Time"}
     if not _should_import_df(df, required):
-        return 0
-    for _, r in _safe_iterrows(df):
-        user_id = _as_int(r.get("Id"))
-        if user_id is None:
-            continue
-        name = _as_str(r.get("Name"))
-        date = _coerce_date(_as_str(r.get("Date")))
-        time = _coerce_time(_as_str(r.get("Time")))
-        ts = _as_ts(date, time)
-        if not ts:
-            continue
-        cur = conn.execute(
-            "INSERT OR IGNORE INTO attendance(user_id, name, ts, date, time) VALUES(?, ?, ?, ?, ?)",
-            (user_id, name, ts, date, time),
-        )
-        inserted += int(cur.rowcount or 0)
-    return inserted
+        return 0, 0
+    ids = _int_col(df, "Id")
+    names = df["Name"].astype("string").fillna("")
+    dates = _str_col(df, "Date")
+    times = _str_col(df, "Time")
+    keep = ids.notna() & (dates != "") & (times != "")
+    if not keep.any():
+        return 0, 0
+    epochs = _parse_wall_epochs(dates[keep] + " " + times[keep])
+    parsed = epochs.notna()
+    keep = keep & parsed.reindex(keep.index, fill_value=False)
+    rows = zip(
+        ids[keep].astype("int64").tolist(),
+        names[keep].tolist(),
+        epochs[parsed].astype("int64").tolist(),
+    )
+    cur = conn.executemany(_SQL_IMPORT_ATTENDANCE, rows)
+    return max(0, cur.rowcount), int((~parsed).sum())
 
 
 def _insert_request_rows(conn: sqlite3.Connection, df: pd.DataFrame) -> int:
-    inserted = 0
     required = {"Name", "Contact", "Message", "Timestamp", "Status"}
     if not _should_import_df(df, required):
         return 0
-    for _, r in _safe_iterrows(df):
-        name = _normalize_name(_as_str(r.get("Name")))
-        contact = _normalize_contact(_as_str(r.get("Contact")))
-        message = _normalize_message(_as_str(r.get("Message")))
-        ts = _normalize_timestamp(_as_str(r.get("Timestamp")))
-        status = _normalize_status(_as_str(r.get("Status")))
-        if not (name and contact and message and ts):
-            continue
-        conn.execute(
-            "INSERT INTO enrollment_requests(name, contact, message, timestamp, status) VALUES(?, ?, ?, ?, ?)",
-            (name, contact, message, ts, status),
+    names = _str_col(df, "Name")
+    contacts = _str_col(df, "Contact")
+    messages = _str_col(df, "Message")
+    stamps = _str_col(df, "Timestamp")
+    statuses = _str_col(df, "Status").replace("", "Pending")
+    keep = (names != "") & (contacts != "") & (messages != "") & (stamps != "")
+    if not keep.any():
+        return 0
+    rows = list(
+        zip(
+            names[keep].tolist(),
+            contacts[keep].tolist(),
+            messages[keep].tolist(),
+            stamps[keep].tolist(),
+            statuses[keep].tolist(),
         )
-        inserted += 1
-    return inserted
+    )
+    conn.executemany(_SQL_INSERT_REQUEST, rows)
+    return len(rows)
 
 
-def _upsert_users(store: "Storage", df: pd.DataFrame) -> int:
-    inserted = 0
+def _upsert_users(conn: sqlite3.Connection, df: pd.DataFrame) -> int:
     required = {"Id", "Name"}
     if not _should_import_df(df, required):
         return 0
-    for _, r in _safe_iterrows(df):
-        user_id = _as_int(r.get("Id"))
-        name = _normalize_name(_as_str(r.get("Name")))
-        if user_id is None or not name:
-            continue
-        store.upsert_user(user_id, name)
-        inserted += 1
-    return inserted
+    ids = _int_col(df, "Id")
+    names = _str_col(df, "Name")
+    keep = ids.notna() & (names != "")
+    if not keep.any():
+        return 0
+    rows = list(zip(ids[keep].astype("int64").tolist(), names[keep].tolist()))
+    conn.executemany(_SQL_UPSERT_USER, rows)
+    return len(rows)
 
 
 def _default_path_if_exists(p: Optional[Path]) -> Optional[Path]:
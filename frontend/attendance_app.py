@@ -2,16 +2,22 @@
 
 from __future__ import annotations
 
+import os
+import re
+from collections import Counter
 import subprocess
 import sys
 import threading
 import tkinter as tk
-from datetime import datetime
+from datetime import date, datetime
 from pathlib import Path
 from tkinter import filedialog, messagebox, simpledialog, ttk
+from tkinter import font as tkfont
 import logging
+from typing import TYPE_CHECKING, Any, Callable
 
-import pandas as pd
+if TYPE_CHECKING:
+    import pandas as pd
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
 if str(ROOT_DIR) not in sys.path:
@@ -22,16 +28,37 @@ from shared.paths import bundle_dir, data_dir, is_frozen
 from shared.settings import Settings, load_settings, save_settings
 
 from backend.attendance_core import (
+    data_stamp,
     delete_user_profile,
     load_attendance,
     load_user_details,
     load_user_records,
     run_recognition,
 )
-from backend.requests_core import add_request, load_requests, update_request_status
+from backend.requests_core import (
+    add_request,
+    count_pending_requests,
+    load_requests,
+    update_request_status,
+)
 
-TITLE_FONT = ('Bahnschrift', 18, 'bold')
-BODY_FONT = ('Bahnschrift', 11)
+# Named Tk fonts, created once in AttendanceApp._configure_style; widgets refer to them by
+# name so Tk resolves each font a single time instead of per widget.
+TITLE_FONT = 'AppTitle'
+BODY_FONT = 'AppBody'
+SUBTITLE_FONT = 'AppSubtitle'
+SECTION_FONT = 'AppSection'
+CARD_TITLE_FONT = 'AppCardTitle'
+HINT_FONT = 'AppHint'
+FONT_SPECS: dict[str, dict[str, Any]] = {
+    TITLE_FONT: {'size': 18, 'weight': 'bold'},
+    BODY_FONT: {'size': 11},
+    SUBTITLE_FONT: {'size': 12},
+    SECTION_FONT: {'size': 12, 'weight': 'bold'},
+    CARD_TITLE_FONT: {'size': 15, 'weight': 'bold'},
+    HINT_FONT: {'size': 10},
+}
+FONT_FAMILY = 'Bahnschrift'
 BG_COLOR = '#0f172a'
 SIDEBAR_COLOR = '#020617'
 CARD_COLOR = '#1e293b'
@@ -40,6 +67,63 @@ HIGHLIGHT_COLOR = '#38bdf8'
 DATA_DIR = data_dir()
 DATASET_DIR = DATA_DIR / 'dataset'
 SCRIPTS_DIR = bundle_dir() / 'scripts'
+ATTENDANCE_COLUMNS = ('Id', 'Name', 'Date', 'Time')
+TIMELINE_WIDTHS = {'Name': 150, 'Date': 100, 'Time': 100}
+REQUEST_COLUMNS = ('RequestId', 'Name', 'Contact', 'Message', 'Timestamp', 'Status')
+REFRESH_POLL_MS = 60000
+CHILD_POLL_MS = 2000
+SUBCOMMAND_SCRIPTS = {
+    'create-dataset': '01_create_dataset.py',
+    'enroll': '01_create_dataset.py',
+    'train-model': '02_train_model.py',
+    'train': '02_train_model.py',
+}
+_SAMPLE_RE = re.compile(r'^User\.(\d+)\.[^.]+\.jpg$')
+
+
+def _sync_tree(tree: ttk.Treeview, rows: list[tuple[str, tuple]]) -> None:
+    """Make ``tree`` show ``rows`` ((iid, values) pairs, in order), touching only changes."""
+    wanted = {iid for iid, _ in rows}
+    existing = tree.get_children()
+    stale = [iid for iid in existing if iid not in wanted]
+    if stale:
+        tree.delete(*stale)
+    known = set(existing)
+    for index, (iid, values) in enumerate(rows):
+        if iid not in known:
+            tree.insert('', index, iid=iid, values=values)
+
+
+def _setup_columns(
+    tree: ttk.Treeview,
+    widths: dict[str, int],
+    *,
+    anchors: dict[str, str] | None = None,
+    headings: dict[str, str] | None = None,
+) -> None:
+    """Set heading text, width and anchor (default centred) for each column in ``widths``."""
+    anchors = anchors or {}
+    headings = headings or {}
+    for col, width in widths.items():
+        tree.heading(col, text=headings.get(col, col))
+        tree.column(col, anchor=anchors.get(col, 'center'), width=width)
+
+
+def _set_if_changed(var: tk.StringVar, value: str) -> None:
+    # Setting a variable fires its traces and relayouts bound labels even for equal text.
+    if var.get() != value:
+        var.set(value)
+
+
+def _spawn_console(cmd: list[str]) -> subprocess.Popen:
+    """Start ``cmd`` directly (no ``cmd.exe /c start`` wrapper), in its own console on Windows."""
+    flags = subprocess.CREATE_NEW_CONSOLE if os.name == 'nt' else 0
+    return subprocess.Popen(cmd, creationflags=flags, close_fds=True)
+
+
+def _log_iid(user_id: Any, date: str, time: str) -> str:
+    # (user, date, time) is unique in the attendance table, so it makes a stable row id.
+    return f'{date}|{time}|{user_id}'
 
 
 class AttendanceViewer(tk.Toplevel):
@@ -50,6 +134,9 @@ class AttendanceViewer(tk.Toplevel):
         self.geometry('680x460')
         self.minsize(620, 420)
         self.resizable(True, True)
+        self._stamp: tuple[int, int] | None = None
+        self._rows: list[tuple[str, tuple]] = []
+        self._first = 0
         self._build_widgets()
         self.refresh()
 
@@ -57,12 +144,20 @@ class AttendanceViewer(tk.Toplevel):
         header = tk.Label(self, text='Logged Attendance', font=TITLE_FONT, fg='white', bg=BG_COLOR)
         header.pack(pady=(16, 8))
 
-        columns = ('Id', 'Name', 'Date', 'Time')
-        self.tree = ttk.Treeview(self, columns=columns, show='headings', height=16)
-        for col in columns:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, anchor='center', width=110)
-        self.tree.pack(fill='both', padx=16, pady=8, expand=True)
+        frame = tk.Frame(self, bg=BG_COLOR)
+        frame.pack(fill='both', padx=16, pady=8, expand=True)
+
+        self.tree = ttk.Treeview(frame, columns=ATTENDANCE_COLUMNS, show='headings', height=16)
+        _setup_columns(self.tree, dict.fromkeys(ATTENDANCE_COLUMNS, 110))
+        self.tree.pack(side='left', fill='both', expand=True)
+
+        # The log grows without bound, so only the rows in view exist as Treeview items;
+        # the scrollbar is driven from the full row count rather than the tree's yview.
+        self.scrollbar = ttk.Scrollbar(frame, orient='vertical', command=self._on_scroll)
+        self.scrollbar.pack(side='right', fill='y')
+        self.tree.bind('<Configure>', lambda _event: self._render())
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.tree.bind(sequence, self._on_wheel)
 
         btn_row = tk.Frame(self, bg=BG_COLOR)
         btn_row.pack(pady=(0, 16))
@@ -78,15 +173,53 @@ class AttendanceViewer(tk.Toplevel):
         close_btn.grid(row=0, column=1, padx=6)
 
     def refresh(self) -> None:
-        df = load_attendance()
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-        if df.empty:
+        stamp = data_stamp()
+        if stamp == self._stamp:
             return
-        for _, record in df.sort_values(['Date', 'Time']).iterrows():
-            self.tree.insert(
-                '', 'end', values=(record['Id'], record['Name'], record['Date'], record['Time'])
+        self._stamp = stamp
+        df = load_attendance()
+        # load_attendance() is already ordered by Date, Time.
+        self._rows = [
+            (_log_iid(user_id, date, time), (user_id, name, date, time))
+            for user_id, name, date, time in df[list(ATTENDANCE_COLUMNS)].itertuples(
+                index=False, name=None
             )
+        ]
+        self._render()
+
+    def _visible_rows(self) -> int:
+        height = self.tree.winfo_height()
+        if height <= 1:
+            # Not mapped yet; fall back to the configured height.
+            return int(self.tree.cget('height'))
+        row_height = int(ttk.Style(self).lookup('Treeview', 'rowheight') or 20)
+        # One row's worth of space goes to the headings.
+        return max(1, height // row_height - 1)
+
+    def _render(self) -> None:
+        visible = self._visible_rows()
+        total = len(self._rows)
+        self._first = max(0, min(self._first, total - visible))
+        window = self._rows[self._first : self._first + visible]
+        _sync_tree(self.tree, window)
+        if total:
+            self.scrollbar.set(self._first / total, (self._first + len(window)) / total)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _on_scroll(self, action: str, amount: str, unit: str = 'units') -> None:
+        if action == 'moveto':
+            self._first = int(float(amount) * len(self._rows))
+        else:
+            step = self._visible_rows() if unit == 'pages' else 1
+            self._first += int(amount) * step
+        self._render()
+
+    def _on_wheel(self, event: tk.Event) -> str:
+        up = event.num == 4 or getattr(event, 'delta', 0) > 0
+        self._first += -3 if up else 3
+        self._render()
+        return 'break'
 
 
 class AttendanceApp(tk.Tk):
@@ -108,6 +241,11 @@ class AttendanceApp(tk.Tk):
 
         self.capture_thread: threading.Thread | None = None
         self.timeline_trees: list[ttk.Treeview] = []
+        self._recent_rows: list[tuple[str, tuple]] = []
+        self._refresh_stamp: tuple[tuple[int, int], str] | None = None
+        self._refresh_job: str | None = None
+        self._refresh_busy = False
+        self._refresh_again = False
 
         self.settings: Settings = load_settings()
 
@@ -132,6 +270,11 @@ class AttendanceApp(tk.Tk):
         save_settings(self.settings)
 
     def _configure_style(self) -> None:
+        # Keep references: a tkfont.Font deletes its named font when garbage-collected.
+        self._fonts = [
+            tkfont.Font(self, name=name, family=FONT_FAMILY, exists=False, **spec)
+            for name, spec in FONT_SPECS.items()
+        ]
         style = ttk.Style(self)
         style.theme_use('clam')
         style.configure(
@@ -170,7 +313,7 @@ class AttendanceApp(tk.Tk):
         subtitle = tk.Label(
             self.sidebar,
             text='Smart capture console',
-            font=('Bahnschrift', 12),
+            font=SUBTITLE_FONT,
             fg='#94a3b8',
             bg=SIDEBAR_COLOR,
         )
@@ -212,7 +355,7 @@ class AttendanceApp(tk.Tk):
         tk.Label(
             self.sidebar,
             text='Session Status',
-            font=('Bahnschrift', 12, 'bold'),
+            font=SECTION_FONT,
             fg='white',
             bg=SIDEBAR_COLOR,
         ).pack(pady=(40, 6))
@@ -265,19 +408,13 @@ class AttendanceApp(tk.Tk):
         settings_btn.pack(pady=(10, 0))
 
     def _build_views(self) -> None:
+        # Views are built on first visit (kiosk mode never builds the admin view).
         self.views: dict[str, tk.Frame] = {}
-        landing_view = tk.Frame(self.content_area, bg=BG_COLOR)
-        admin_view = tk.Frame(self.content_area, bg=BG_COLOR)
-        user_view = tk.Frame(self.content_area, bg=BG_COLOR)
-        for frame in (landing_view, admin_view, user_view):
-            frame.grid(row=0, column=0, sticky='nsew')
-        self.views['landing'] = landing_view
-        self.views['admin'] = admin_view
-        self.views['user'] = user_view
-
-        self._build_landing_view(landing_view)
-        self._build_admin_view(admin_view)
-        self._build_user_view(user_view)
+        self._view_builders: dict[str, Callable[[tk.Frame], None]] = {
+            'landing': self._build_landing_view,
+            'admin': self._build_admin_view,
+            'user': self._build_user_view,
+        }
         self.switch_view('landing')
 
     def _build_landing_view(self, parent: tk.Frame) -> None:
@@ -395,11 +532,9 @@ class AttendanceApp(tk.Tk):
         timeline_body.columnconfigure(0, weight=1)
 
         tree = ttk.Treeview(
-            timeline_body, columns=('Name', 'Date', 'Time'), show='headings', height=8
+            timeline_body, columns=tuple(TIMELINE_WIDTHS), show='headings', height=8
         )
-        for col in ('Name', 'Date', 'Time'):
-            tree.heading(col, text=col)
-            tree.column(col, width=150 if col == 'Name' else 100, anchor='center')
+        _setup_columns(tree, TIMELINE_WIDTHS)
         tree.grid(row=0, column=0, sticky='nsew')
         scrollbar = ttk.Scrollbar(timeline_body, orient='vertical', command=tree.yview)
         scrollbar.grid(row=0, column=1, sticky='ns', padx=(6, 0))
@@ -449,11 +584,9 @@ class AttendanceApp(tk.Tk):
         )
         timeline_card.grid(row=1, column=0, columnspan=2, padx=16, pady=(8, 16), sticky='nsew')
         tree = ttk.Treeview(
-            timeline_card, columns=('Name', 'Date', 'Time'), show='headings', height=8
+            timeline_card, columns=tuple(TIMELINE_WIDTHS), show='headings', height=8
         )
-        for col in ('Name', 'Date', 'Time'):
-            tree.heading(col, text=col)
-            tree.column(col, width=150 if col == 'Name' else 100, anchor='center')
+        _setup_columns(tree, TIMELINE_WIDTHS)
         tree.pack(side='left', fill='both', expand=True)
         scrollbar = ttk.Scrollbar(timeline_card, orient='vertical', command=tree.yview)
         scrollbar.pack(side='right', fill='y', padx=(6, 0))
@@ -464,9 +597,7 @@ class AttendanceApp(tk.Tk):
         card = tk.Frame(
             parent, bg=CARD_COLOR, bd=0, highlightthickness=0, relief='flat', padx=18, pady=12
         )
-        tk.Label(
-            card, text=title, font=('Bahnschrift', 15, 'bold'), fg='white', bg=CARD_COLOR
-        ).pack(anchor='w')
+        tk.Label(card, text=title, font=CARD_TITLE_FONT, fg='white', bg=CARD_COLOR).pack(anchor='w')
         tk.Label(
             card,
             text=subtitle,
@@ -480,57 +611,122 @@ class AttendanceApp(tk.Tk):
 
     def switch_view(self, view_name: str) -> None:
         frame = self.views.get(view_name)
-        if not frame:
-            return
+        if frame is None:
+            builder = self._view_builders.get(view_name)
+            if builder is None:
+                return
+            frame = tk.Frame(self.content_area, bg=BG_COLOR)
+            frame.grid(row=0, column=0, sticky='nsew')
+            builder(frame)
+            self.views[view_name] = frame
         frame.tkraise()
         self.current_view.set(view_name)
+        # Hidden timelines are skipped by refreshes; catch this one up as it comes into view.
+        self._sync_timelines(view_name)
+
+    def _sync_timelines(self, view_name: str) -> None:
+        frame = self.views.get(view_name)
+        if frame is None:
+            return
+        prefix = f'{frame}.'
+        for tree in self.timeline_trees:
+            if str(tree).startswith(prefix):
+                _sync_tree(tree, self._recent_rows)
 
     def _refresh_data(self) -> None:
+        if self._refresh_job is not None:
+            self.after_cancel(self._refresh_job)
+            self._refresh_job = None
+        if self._refresh_busy:
+            # A worker is already out; run once more as soon as it lands.
+            self._refresh_again = True
+            return
+        self._refresh_busy = True
+        # Loading and aggregating run on a worker; only widget updates touch the Tk thread.
+        threading.Thread(target=self._collect_refresh, daemon=True).start()
+
+    def _collect_refresh(self) -> None:
+        result: dict[str, Any] | None = None
+        try:
+            result = self._summarize_data()
+        except Exception:
+            self._logger.exception('Dashboard refresh failed')
+        self.after(0, lambda r=result: self._apply_refresh(r))
+
+    def _summarize_data(self) -> dict[str, Any] | None:
+        today = date.today().isoformat()
+        # Nothing was written since the last tick (and the day hasn't rolled over).
+        stamp = (data_stamp(), today)
+        if stamp == self._refresh_stamp:
+            return None
+
+        # Always a frame with ATTENDANCE_COLUMNS, even when the log is empty.
         df = load_attendance()
-        if df is None or getattr(df, 'empty', True):
-            df = pd.DataFrame(columns=['Id', 'Name', 'Date', 'Time'])
 
-        recent = (
-            df.sort_values(['Date', 'Time'], ascending=False).head(10)
-            if not df.empty
-            else pd.DataFrame()
-        )
-        for tree in self.timeline_trees:
-            tree.delete(*tree.get_children())
-            if recent.empty:
-                continue
-            for _, record in recent.iterrows():
-                tree.insert('', 'end', values=(record['Name'], record['Date'], record['Time']))
-
-        today = datetime.now().strftime('%Y-%m-%d')
-        today_df = df[df['Date'] == today] if 'Date' in df.columns else pd.DataFrame()
-        self.today_total_var.set(f"{len(today_df)} logs captured today")
-        unique_faces = today_df['Id'].nunique() if 'Id' in today_df else 0
-        self.unique_students_var.set(f"{unique_faces} unique faces today")
+        # load_attendance() is already ordered by Date, Time: newest ten are the tail.
+        recent = df[list(ATTENDANCE_COLUMNS)].tail(10).iloc[::-1]
+        recent_rows = [
+            (_log_iid(user_id, date, time), (name, date, time))
+            for user_id, name, date, time in recent.itertuples(index=False, name=None)
+        ]
+
+        # Rows are sorted by Date, so today's block is a binary-searched slice, not a scan.
+        dates = df['Date']
+        today_df = df.iloc[dates.searchsorted(today, 'left') : dates.searchsorted(today, 'right')]
+        unique_faces = today_df['Id'].nunique()
 
         try:
-            user_map = load_user_details()
-            self.registered_var.set(f"{len(user_map)} registered users")
+            registered: int | None = len(load_user_details())
         except Exception:
-            self.registered_var.set('No registered users detected')
+            registered = None
+
+        total_pending = count_pending_requests()
+
+        # Only remember the stamp once the summary exists, so a failed read is retried next tick.
+        self._refresh_stamp = stamp
+        return {
+            'recent': recent_rows,
+            'today_total': len(today_df),
+            'unique_faces': unique_faces,
+            'registered': registered,
+            'pending': total_pending,
+        }
+
+    def _apply_refresh(self, result: dict[str, Any] | None) -> None:
+        if result is not None:
+            self._recent_rows = result['recent']
+            self._sync_timelines(self.current_view.get())
+
+            _set_if_changed(self.today_total_var, f"{result['today_total']} logs captured today")
+            _set_if_changed(
+                self.unique_students_var, f"{result['unique_faces']} unique faces today"
+            )
 
-        pending_df = load_requests()
-        if pending_df is None or getattr(pending_df, 'empty', True):
-            total_pending = 0
-        else:
-            status_series = pending_df['Status'] if 'Status' in pending_df.columns else None
-            if status_series is not None:
-                total_pending = status_series.str.contains('Pending', case=False, na=False).sum()
+            if result['registered'] is None:
+                registered_text = 'No registered users detected'
             else:
-                total_pending = len(pending_df)
-        if total_pending:
-            self.pending_requests_var.set(
-                f"{total_pending} pending enrollment requests awaiting review."
-            )
-        else:
-            self.pending_requests_var.set('No pending enrollment requests.')
+                registered_text = f"{result['registered']} registered users"
+            _set_if_changed(self.registered_var, registered_text)
 
-        self.after(60000, self._refresh_data)
+            total_pending = result['pending']
+            if total_pending:
+                pending_text = f"{total_pending} pending enrollment requests awaiting review."
+            else:
+                pending_text = 'No pending enrollment requests.'
+            _set_if_changed(self.pending_requests_var, pending_text)
+
+        self._refresh_busy = False
+        if self._refresh_again:
+            self._refresh_again = False
+            self._refresh_data()
+            return
+        # In-app writes push a refresh themselves (notify_data_changed); this poll only picks
+        # up writes from elsewhere and is a stat() call when nothing changed.
+        self._refresh_job = self.after(REFRESH_POLL_MS, self._refresh_data)
+
+    def notify_data_changed(self) -> None:
+        """Refresh the dashboard now instead of on the next poll; safe from any thread."""
+        self.after(0, self._refresh_data)
 
     def start_capture(self) -> None:
         if self.capture_thread and self.capture_thread.is_alive():
@@ -553,6 +749,7 @@ class AttendanceApp(tk.Tk):
 
         def handle_log(name: str, time_str: str) -> None:
             thread_safe_update(self.last_log_var, f'Last log • {name} @ {time_str}')
+            self.notify_data_changed()
 
         try:
             run_recognition(
@@ -644,7 +841,7 @@ class AttendanceApp(tk.Tk):
             win,
             text='Tip: If recognition is too strict, increase LBPH threshold.\n'
             'Duplicate window prevents multiple logs within N minutes.',
-            font=('Bahnschrift', 10),
+            font=HINT_FONT,
             fg='#94a3b8',
             bg=BG_COLOR,
             justify='left',
@@ -746,7 +943,7 @@ class AttendanceApp(tk.Tk):
             cmd.extend(['--id', str(int(face_id))])
             cmd.extend(['--name', str(face_name)])
             cmd.extend(['--camera-index', str(int(self.settings.camera_index))])
-            subprocess.Popen(['cmd.exe', '/c', 'start', '', *cmd])
+            self._watch_child(_spawn_console(cmd), 'Enrollment', 'Enrollment window closed.')
             messagebox.showinfo(
                 'Enrollment Started',
                 'The enrollment camera window will open in a moment.\n\n'
@@ -776,7 +973,7 @@ class AttendanceApp(tk.Tk):
                     )
                     return
                 cmd = [sys.executable, str(script_path)]
-            subprocess.Popen(['cmd.exe', '/c', 'start', '', *cmd])
+            self._watch_child(_spawn_console(cmd), 'Training', 'Model training finished.')
             messagebox.showinfo(
                 'Training Launched',
                 'Training started. Wait for it to finish before the next capture.',
@@ -786,6 +983,19 @@ class AttendanceApp(tk.Tk):
         finally:
             self.status_var.set('Idle — ready to capture.')
 
+    def _watch_child(self, proc: subprocess.Popen, label: str, done_message: str) -> None:
+        # Polled from the Tk loop so nothing blocks while the child console runs.
+        code = proc.poll()
+        if code is None:
+            self.after(CHILD_POLL_MS, lambda: self._watch_child(proc, label, done_message))
+            return
+        if code == 0:
+            self.status_var.set(done_message)
+        else:
+            self.status_var.set(f'{label} exited with code {code}.')
+        # The child may have written users to the database.
+        self.notify_data_changed()
+
     def open_request_viewer(self) -> None:
         RequestViewer(self)
 
@@ -804,7 +1014,8 @@ class RequestViewer(tk.Toplevel):
         self.geometry('680x460')
         self.minsize(620, 420)
         self.resizable(True, True)
-        self._rows: dict[str, dict] = {}
+        self._df: pd.DataFrame | None = None
+        self._stamp: tuple[int, int] | None = None
         self._build_widgets()
         self.refresh()
 
@@ -812,12 +1023,9 @@ class RequestViewer(tk.Toplevel):
         header = tk.Label(self, text='Pending Requests', font=TITLE_FONT, fg='white', bg=BG_COLOR)
         header.pack(pady=(14, 8))
 
-        cols = ('RequestId', 'Name', 'Contact', 'Message', 'Timestamp', 'Status')
-        self.tree = ttk.Treeview(self, columns=cols, show='headings', height=14)
-        for col in cols:
-            self.tree.heading(col, text=col)
-            width = 80 if col == 'RequestId' else 110
-            self.tree.column(col, anchor='center', width=width)
+        self.tree = ttk.Treeview(self, columns=REQUEST_COLUMNS, show='headings', height=14)
+        _setup_columns(self.tree, {**dict.fromkeys(REQUEST_COLUMNS, 110), 'RequestId': 80})
+        self.tree.tag_configure('approved', foreground='#64748b')
         self.tree.pack(fill='both', padx=16, pady=8, expand=True)
 
         btn_frame = tk.Frame(self, bg=BG_COLOR)
@@ -852,43 +1060,42 @@ class RequestViewer(tk.Toplevel):
         close_btn.grid(row=0, column=3, padx=6)
 
     def refresh(self) -> None:
-        df = load_requests()
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-        self._rows.clear()
-        if df.empty:
+        stamp = data_stamp()
+        if stamp == self._stamp:
             return
-        for _, record in df.iterrows():
-            item = self.tree.insert(
-                '',
-                'end',
-                values=(
-                    record['RequestId'],
-                    record['Name'],
-                    record['Contact'],
-                    record['Message'],
-                    record['Timestamp'],
-                    record['Status'],
-                ),
-            )
-            self._rows[item] = record.to_dict()
+        self._stamp = stamp
+        df = load_requests()
+        self.tree.delete(*self.tree.get_children())
+        # One vectorized pass flags approved requests; they are greyed out in the list.
+        approved = df['Status'].astype(str).str.lower().str.startswith('approved')
+        # Rows are looked up by RequestId (also the Treeview iid) only when selected.
+        self._df = df.assign(Approved=approved).set_index('RequestId', drop=False)
+        rows = df[list(REQUEST_COLUMNS)].itertuples(index=False, name=None)
+        for values, is_approved in zip(rows, approved.tolist()):
+            tags = ('approved',) if is_approved else ()
+            self.tree.insert('', 'end', iid=str(values[0]), values=values, tags=tags)
 
     def _get_selected_request(self) -> dict | None:
         selection = self.tree.selection()
         if not selection:
             messagebox.showinfo('No Selection', 'Select a request first.')
             return None
-        return self._rows.get(selection[0])
+        if self._df is None:
+            return None
+        try:
+            return self._df.loc[int(selection[0])].to_dict()
+        except (KeyError, ValueError):
+            return None
 
     def accept_request(self) -> None:
         record = self._get_selected_request()
         if not record:
             return
-        if str(record.get('Status', '')).lower().startswith('approved'):
+        if record['Approved']:
             messagebox.showinfo('Already Approved', 'This request was already approved.')
             return
         name = record['Name']
-        request_id = int(record['RequestId'])
+        request_id = record['RequestId']
         face_id = simpledialog.askinteger(
             'Assign User ID', f'Enter numeric ID for {name}:', minvalue=1
         )
@@ -900,18 +1107,23 @@ class RequestViewer(tk.Toplevel):
             messagebox.showerror('Action Unavailable', 'Cannot launch enrollment from this window.')
             return
         update_request_status(request_id, f'Approved (ID {face_id})')
+        self.master.notify_data_changed()
         messagebox.showinfo(
             'Request Approved', 'Capture window launched. Remember to retrain after capture.'
         )
+        self._stamp = None
         self.refresh()
 
     def reject_request(self) -> None:
         record = self._get_selected_request()
         if not record:
             return
-        request_id = int(record['RequestId'])
+        request_id = record['RequestId']
         update_request_status(request_id, 'Rejected')
+        self._stamp = None
         self.refresh()
+        if isinstance(self.master, AttendanceApp):
+            self.master.notify_data_changed()
 
 
 class EnrollmentRequestForm(tk.Toplevel):
@@ -962,6 +1174,8 @@ class EnrollmentRequestForm(tk.Toplevel):
         except ValueError as exc:
             messagebox.showerror('Invalid Request', str(exc))
             return
+        if isinstance(self.master, AttendanceApp):
+            self.master.notify_data_changed()
         messagebox.showinfo('Request Sent', 'Your request was sent to the admin for approval.')
         self.destroy()
 
@@ -974,6 +1188,10 @@ class UserManager(tk.Toplevel):
         self.geometry('580x420')
         self.resizable(False, False)
         self.status_var = tk.StringVar(value='Loading users...')
+        self._stamp: tuple[tuple[int, int], int] | None = None
+        self._loading = False
+        self._load_again = False
+        self._deleting = False
         self._build_widgets()
         self.refresh()
 
@@ -995,11 +1213,12 @@ class UserManager(tk.Toplevel):
         frame.pack(fill='both', expand=True, padx=16, pady=10)
 
         self.tree = ttk.Treeview(frame, columns=cols, show='headings', height=10)
-        for col in cols:
-            heading = 'Sample Count' if col == 'Samples' else col
-            self.tree.heading(col, text=heading)
-            width = 90 if col in ('Id', 'Samples') else 260
-            self.tree.column(col, anchor='center' if col != 'Name' else 'w', width=width)
+        _setup_columns(
+            self.tree,
+            {'Id': 90, 'Name': 260, 'Samples': 90},
+            anchors={'Name': 'w'},
+            headings={'Samples': 'Sample Count'},
+        )
         self.tree.pack(side='left', fill='both', expand=True)
 
         scrollbar = ttk.Scrollbar(frame, orient='vertical', command=self.tree.yview)
@@ -1031,7 +1250,7 @@ class UserManager(tk.Toplevel):
         reminder = tk.Label(
             self,
             text='Reminder: Run 02_train_model.py after deleting users to keep the model in sync.',
-            font=('Bahnschrift', 10),
+            font=HINT_FONT,
             fg=HIGHLIGHT_COLOR,
             bg=BG_COLOR,
         )
@@ -1043,21 +1262,65 @@ class UserManager(tk.Toplevel):
         status_label.pack()
 
     def refresh(self) -> None:
-        df = load_user_records()
-        self.tree.delete(*self.tree.get_children())
-        if df.empty:
-            self.status_var.set('No registered users yet.')
+        # Sample counts come from the dataset folder, so its mtime is part of the key.
+        try:
+            dataset_mtime = DATASET_DIR.stat().st_mtime_ns
+        except OSError:
+            dataset_mtime = 0
+        stamp = (data_stamp(), dataset_mtime)
+        if stamp == self._stamp:
             return
+        if self._loading:
+            self._load_again = True
+            return
+        self._loading = True
+        # The roster load and dataset scan run on a worker; only the tree fill is on Tk.
+        threading.Thread(target=self._load_rows, args=(stamp,), daemon=True).start()
 
-        dataset_dir = DATASET_DIR
-        for _, row in df.iterrows():
-            user_id = int(row['Id'])
-            samples = self._count_samples(dataset_dir, user_id)
-            self.tree.insert('', 'end', values=(user_id, row['Name'], samples))
-
-        self.status_var.set(f'{len(df)} user(s) loaded.')
+    def _load_rows(self, stamp: tuple[tuple[int, int], int]) -> None:
+        rows: list[tuple[int, str, int]] | None = None
+        error: Exception | None = None
+        try:
+            df = load_user_records()
+            samples = self._count_samples(DATASET_DIR)
+            # Id is int64 from storage; tolist() yields plain Python ints with no per-row boxing.
+            rows = [
+                (user_id, name, samples.get(user_id, 0))
+                for user_id, name in zip(df['Id'].tolist(), df['Name'].tolist())
+            ]
+        except Exception as exc:
+            error = exc
+        try:
+            self.after(0, lambda: self._apply_rows(stamp, rows, error))
+        except (RuntimeError, tk.TclError):
+            pass  # Window closed while loading.
+
+    def _apply_rows(
+        self,
+        stamp: tuple[tuple[int, int], int],
+        rows: list[tuple[int, str, int]] | None,
+        error: Exception | None,
+    ) -> None:
+        self._loading = False
+        if rows is None:
+            self.status_var.set(f'Failed to load users: {error}')
+        else:
+            self._stamp = stamp
+            self.tree.delete(*self.tree.get_children())
+            for values in rows:
+                self.tree.insert('', 'end', values=values)
+            if rows:
+                self.status_var.set(f'{len(rows)} user(s) loaded.')
+            else:
+                self.status_var.set('No registered users yet.')
+        if self._load_again:
+            self._load_again = False
+            self.refresh()
 
     def delete_selected_user(self) -> None:
+        if self._deleting:
+            messagebox.showinfo('Delete Running', 'A user is already being deleted.')
+            return
         selection = self.tree.selection()
         if not selection:
             messagebox.showinfo('Select User', 'Choose a user row first.')
@@ -1075,13 +1338,34 @@ class UserManager(tk.Toplevel):
         if not confirm:
             return
 
+        self._deleting = True
+        self.status_var.set(f'Deleting {user_name}...')
+        # Removing the sample images is one unlink per file; keep it off the Tk thread.
+        threading.Thread(target=self._delete_user, args=(user_id, user_name), daemon=True).start()
+
+    def _delete_user(self, user_id: int, user_name: str) -> None:
+        summary: dict | None = None
+        error: Exception | None = None
         try:
             summary = delete_user_profile(user_id)
         except Exception as exc:
-            messagebox.showerror('Delete Failed', str(exc))
+            error = exc
+        try:
+            self.after(0, lambda: self._finish_delete(user_name, summary, error))
+        except (RuntimeError, tk.TclError):
+            pass  # Window closed while deleting.
+
+    def _finish_delete(self, user_name: str, summary: dict | None, error: Exception | None) -> None:
+        self._deleting = False
+        if summary is None:
+            self.status_var.set('Delete failed.')
+            messagebox.showerror('Delete Failed', str(error))
             return
 
+        self._stamp = None
         self.refresh()
+        if isinstance(self.master, AttendanceApp):
+            self.master.notify_data_changed()
         messagebox.showinfo(
             'User Deleted',
             f"Removed {user_name}. Deleted {summary.get('samples_removed', 0)} sample images. Remember to retrain (02_train_model.py).",
@@ -1091,14 +1375,21 @@ class UserManager(tk.Toplevel):
             parent_status.set('User removed. Retrain model before next capture session.')
 
     @staticmethod
-    def _count_samples(dataset_dir: Path, user_id: int) -> int:
+    def _count_samples(dataset_dir: Path) -> Counter[int]:
+        """Sample images per user id (``User.<id>.<n>.jpg``), from one directory pass."""
+        counts: Counter[int] = Counter()
         if not dataset_dir.exists():
-            return 0
-        return sum(1 for _ in dataset_dir.glob(f'User.{user_id}.*.jpg'))
+            return counts
+        with os.scandir(dataset_dir) as entries:
+            for entry in entries:
+                # is_file() is answered from the cached dirent type, without a stat call.
+                if (match := _SAMPLE_RE.match(entry.name)) and entry.is_file(follow_symlinks=False):
+                    counts[int(match.group(1))] += 1
+        return counts
 
 
 def main() -> None:
-    kiosk = '--kiosk' in {a.strip().lower() for a in sys.argv[1:]}
+    kiosk = any(a.strip().lower() == '--kiosk' for a in sys.argv[1:])
     app = AttendanceApp(kiosk_mode=kiosk)
     if kiosk:
         app.switch_view('user')
@@ -1109,18 +1400,11 @@ if __name__ == '__main__':
     # When frozen as an exe, re-invoke the same binary with a subcommand to
     # run enrollment/training in a separate console window.
     if len(sys.argv) > 1:
-        subcommand = sys.argv[1].strip().lower()
-        if subcommand in {'create-dataset', 'enroll'}:
-            import runpy
-
-            script_path = bundle_dir() / 'scripts' / '01_create_dataset.py'
-            sys.argv = [str(script_path), *sys.argv[2:]]
-            runpy.run_path(str(script_path), run_name='__main__')
-            raise SystemExit(0)
-        if subcommand in {'train-model', 'train'}:
+        script_name = SUBCOMMAND_SCRIPTS.get(sys.argv[1].strip().lower())
+        if script_name is not None:
             import runpy
 
-            script_path = bundle_dir() / 'scripts' / '02_train_model.py'
+            script_path = bundle_dir() / 'scripts' / script_name
             sys.argv = [str(script_path), *sys.argv[2:]]
             runpy.run_path(str(script_path), run_name='__main__')
             raise SystemExit(0)
@@ -1,7 +1,10 @@
 import cv2
 import numpy as np
-from PIL import Image
+import os
+import re
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
@@ -16,6 +19,46 @@ DATASET_DIR = DATA_DIR / 'dataset'
 CASCADE_PATH = assets_dir() / 'haarcascade_frontalface_default.xml'
 MODEL_PATH = MODELS_DIR / 'trainer.yml'
 FACE_SIZE = (200, 200)
+_LABEL_RE = re.compile(r'^User\.(\d+)\.')
+
+
+_worker = threading.local()
+
+
+def _worker_tools():
+    # Cascade classifiers and CLAHE objects are not safe to share across threads.
+    tools = getattr(_worker, 'tools', None)
+    if tools is None:
+        tools = _worker.tools = (
+            cv2.CascadeClassifier(str(CASCADE_PATH)),
+            cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8)),
+        )
+    return tools
+
+
+def _load_samples(image_path: Path):
+    # Decodes straight into a grey uint8 array; returns None instead of raising.
+    img_numpy = cv2.imread(str(image_path), cv2.IMREAD_GRAYSCALE)
+    if img_numpy is None:
+        print(f'[WARN] Could not read {image_path}, skipping...')
+        return None
+
+    detector, clahe = _worker_tools()
+    enhanced = clahe.apply(img_numpy)
+    h, w = enhanced.shape[:2]
+
+    # 01_create_dataset.py saves tight FACE_SIZE face crops; use those as-is and only run
+    # the cascade on other images (e.g. photos copied into the dataset folder).
+    if (w, h) == FACE_SIZE:
+        return [enhanced]
+
+    faces = detector.detectMultiScale(enhanced, scaleFactor=1.1, minNeighbors=6, minSize=(80, 80))
+
+    # If the cascade can't find a face, fall back to using the full frame.
+    if len(faces) == 0:
+        faces = [(0, 0, w, h)]
+
+    return [cv2.resize(enhanced[y : y + h, x : x + w], FACE_SIZE) for x, y, w, h in faces]
 
 
 def get_images_and_labels(dataset_dir: Path):
@@ -23,41 +66,25 @@ def get_images_and_labels(dataset_dir: Path):
     if not image_paths:
         raise FileNotFoundError('Dataset is empty. Run 01_create_dataset.py first.')
 
-    detector = cv2.CascadeClassifier(str(CASCADE_PATH))
-    clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-    face_samples, ids = [], []
-
+    # Labels are parsed for all names up front; workers only decode and crop.
+    paths, labels = [], []
     for image_path in image_paths:
-        try:
-            pil_img = Image.open(image_path).convert('L')
-        except IOError:
-            print(f'[WARN] Could not read {image_path}, skipping...')
-            continue
-
-        img_numpy = np.array(pil_img, 'uint8')
-        enhanced = clahe.apply(img_numpy)
-
-        try:
-            label = int(image_path.stem.split('.')[1])
-        except (IndexError, ValueError):
+        match = _LABEL_RE.match(image_path.name)
+        if match is None:
             print(f'[WARN] Unexpected filename format: {image_path.name}, skipping...')
             continue
+        paths.append(image_path)
+        labels.append(int(match.group(1)))
 
-        faces = detector.detectMultiScale(
-            enhanced, scaleFactor=1.1, minNeighbors=6, minSize=(80, 80)
-        )
-
-        # Most dataset images are already cropped face ROIs.
-        # If the cascade can't find a face in the ROI, fall back to using the full frame.
-        if len(faces) == 0:
-            h, w = enhanced.shape[:2]
-            faces = [(0, 0, w, h)]
-
-        for x, y, w, h in faces:
-            roi = enhanced[y : y + h, x : x + w]
-            roi = cv2.resize(roi, FACE_SIZE)
-            face_samples.append(roi)
-            ids.append(label)
+    face_samples, ids = [], []
+    # Decoding, CLAHE and detection release the GIL, so images are processed in parallel;
+    # map() keeps results in path order, so training input stays deterministic.
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        for rois, label in zip(pool.map(_load_samples, paths), labels):
+            if rois is None:
+                continue
+            face_samples.extend(rois)
+            ids.extend([label] * len(rois))
 
     if not ids:
         raise RuntimeError('No faces were detected inside the dataset. Ensure captures are clear.')
@@ -55,7 +55,7 @@ def main() -> int:
         requests_csv=None if args.skip_requests else args.requests,
     )
 
-    with store._connect() as conn:  # intentional: small admin script
+    with store._conn() as conn:  # intentional: small admin script
         users = int(conn.execute("SELECT COUNT(*) FROM users").fetchone()[0])
         attendance = int(conn.execute("SELECT COUNT(*) FROM attendance").fetchone()[0])
         requests = int(conn.execute("SELECT COUNT(*) FROM enrollment_requests").fetchone()[0])
@@ -63,6 +63,7 @@ def main() -> int:
     print("Import summary:")
     print(f"  users_upserted: {summary['users_upserted']}")
     print(f"  attendance_inserted: {summary['attendance_inserted']}")
+    print(f"  attendance_rejected (unparseable Date/Time): {summary['attendance_rejected']}")
     print(f"  requests_inserted: {summary['requests_inserted']}")
     print("DB counts:")
     print(f"  users: {users}")
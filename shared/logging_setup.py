@@ -1,21 +1,25 @@
 from __future__ import annotations
 
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 from shared.paths import runtime_dir
 
 
 _LOGGER_CONFIGURED = False
+_LISTENER: QueueListener | None = None
 
 
 def configure_logging(*, level: int = logging.INFO) -> None:
     """Configure root logging to a rotating file under the runtime directory.
 
-    Safe to call multiple times.
+    Records are handed to a queue and written by a background listener thread, so
+    logging from the capture loop never waits on disk. Safe to call multiple times.
     """
 
-    global _LOGGER_CONFIGURED
+    global _LOGGER_CONFIGURED, _LISTENER
     if _LOGGER_CONFIGURED:
         return
 
@@ -44,7 +48,12 @@ def configure_logging(*, level: int = logging.INFO) -> None:
     stream_handler.setLevel(level)
     stream_handler.setFormatter(fmt)
 
-    root.addHandler(file_handler)
-    root.addHandler(stream_handler)
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    _LISTENER = QueueListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
+    _LISTENER.start()
+    # Stopping drains the queue, so records logged just before exit still reach the file.
+    atexit.register(_LISTENER.stop)
+
+    root.addHandler(QueueHandler(log_queue))
 
     _LOGGER_CONFIGURED = True
@@ -2,13 +2,16 @@ from __future__ import annotations
 
 import os
 import sys
+from functools import lru_cache
 from pathlib import Path
 
 
+@lru_cache(maxsize=None)
 def is_frozen() -> bool:
     return bool(getattr(sys, "frozen", False)) and hasattr(sys, "_MEIPASS")
 
 
+@lru_cache(maxsize=None)
 def bundle_dir() -> Path:
     """Directory containing bundled read-only resources.
 
@@ -28,7 +31,13 @@ def runtime_dir() -> Path:
     - PyInstaller: folder containing the .exe (portable) OR LocalAppData fallback
     """
 
-    override = os.getenv("FACEATTENDANCE_RUNTIME_DIR")
+    return _runtime_dir(os.getenv("FACEATTENDANCE_RUNTIME_DIR") or "")
+
+
+@lru_cache(maxsize=None)
+def _runtime_dir(override: str) -> Path:
+    # Keyed on the override so changing FACEATTENDANCE_RUNTIME_DIR still takes effect,
+    # while the frozen write probe below runs once per process.
     if override:
         return Path(override).expanduser().resolve()
 
@@ -54,6 +63,8 @@ def assets_dir() -> Path:
 
 
 def data_dir() -> Path:
+    # Only the runtime dir is cached: the mkdir runs every call so a deleted data/ or
+    # models/ folder is recreated instead of handing back a path that no longer exists.
     path = runtime_dir() / "data"
     path.mkdir(parents=True, exist_ok=True)
     return path
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import os
 from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Any, Dict
@@ -71,4 +72,7 @@ def load_settings(path: Path = SETTINGS_FILE) -> Settings:
 def save_settings(settings: Settings, path: Path = SETTINGS_FILE) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     payload = asdict(settings)
-    path.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+    # Write a sibling file and swap it in, so a crash mid-write never leaves a torn file.
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp_path, path)
@@ -1,9 +1,20 @@
 from __future__ import annotations
 
+import atexit
+import os
+import shutil
 import sys
+import tempfile
 from pathlib import Path
 
 # Ensure repo root is importable in tests (backend/, frontend/, shared/ are top-level packages).
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+# Backend modules open the runtime DB at import time (and may migrate the repo's CSVs into it),
+# so point them at a throwaway dir before any test module imports them.
+if not os.getenv("FACEATTENDANCE_RUNTIME_DIR"):
+    _RUNTIME_DIR = tempfile.mkdtemp(prefix="faceattendance-tests-")
+    os.environ["FACEATTENDANCE_RUNTIME_DIR"] = _RUNTIME_DIR
+    atexit.register(shutil.rmtree, _RUNTIME_DIR, ignore_errors=True)
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+import backend.attendance_core as core
+from backend.attendance_core import _RollingVotes
+from backend.storage import Storage
+
+
+def test_rolling_votes_tracks_window_leader() -> None:
+    votes = _RollingVotes(4)
+    for label, distance in [(1, 10.0), (1, 20.0), (2, 50.0), (2, 60.0), (2, 70.0)]:
+        votes.push(label, distance)
+
+    # Window is now [1, 2, 2, 2]; label 1 lost one vote to eviction.
+    assert len(votes) == 4
+    assert votes.leader() == (2, 3)
+    assert votes.mean_distance(2) == 60.0
+    assert votes.mean_distance(3) is None
+
+
+def test_user_map_follows_users_table_without_retrain(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    model_path = tmp_path / 'trainer.yml'
+    model_path.write_text('stub', encoding='utf-8')
+    store = Storage(tmp_path / 'test.sqlite3')
+    monkeypatch.setattr(core, 'MODEL_PATH', model_path)
+    monkeypatch.setattr(core, '_STORAGE', store)
+    monkeypatch.setattr(core, '_MODEL_CACHE', {})
+
+    store.upsert_user(1, 'User1')
+    assert core._get_user_map() == {1: 'User1'}
+
+    # A rename from another instance (e.g. the admin UI in a second process).
+    Storage(tmp_path / 'test.sqlite3').upsert_user(1, 'Renamed')
+    assert core._get_user_map() == {1: 'Renamed'}
+
+
+def test_module_storage_stays_out_of_the_repo() -> None:
+    # conftest.py redirects the runtime dir before this module is imported.
+    repo_root = Path(__file__).resolve().parents[1]
+    assert not core._STORAGE.db_path.resolve().is_relative_to(repo_root)
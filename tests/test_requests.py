@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+import pandas as pd
+
+from backend.requests_core import _normalize
+
+
+def test_normalize_fills_missing_request_ids() -> None:
+    df = pd.DataFrame({"RequestId": [3, None, 1, None], "Name": ["a", "b", "c", "d"]})
+    out = _normalize(df)
+    assert out["RequestId"].tolist() == [3, 4, 1, 5]
+    assert out["RequestId"].dtype.kind == "i"
@@ -1,31 +1,260 @@
 from __future__ import annotations
 
-import os
+import sqlite3
+from datetime import datetime, timedelta
 from pathlib import Path
 
 import pandas as pd
 
-from backend.storage import Storage
+from backend.storage import SCHEMA_VERSION, Storage
 
 
-def test_storage_basic_flow(tmp_path: Path) -> None:
-    os.environ["FACEATTENDANCE_RUNTIME_DIR"] = str(tmp_path)
-    try:
-        store = Storage(tmp_path / "test.sqlite3")
-        store.upsert_user(1, "User1")
-        users = store.users_df()
-        assert not users.empty
-        assert int(users.iloc[0]["Id"]) == 1
+def test_storage_basic_flow(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("FACEATTENDANCE_RUNTIME_DIR", str(tmp_path))
+    store = Storage(tmp_path / "test.sqlite3")
+    store.upsert_user(1, "User1")
+    users = store.users_df()
+    assert not users.empty
+    assert int(users.iloc[0]["Id"]) == 1
 
-        result1 = store.log_attendance(user_id=1, user_name="User1", min_minutes_between_logs=10)
-        assert result1.logged is True
+    result1 = store.log_attendance(user_id=1, user_name="User1", min_minutes_between_logs=10)
+    assert result1.logged is True
 
-        result2 = store.log_attendance(user_id=1, user_name="User1", min_minutes_between_logs=10)
-        # same-day rule should block duplicates
-        assert result2.logged is False
+    result2 = store.log_attendance(user_id=1, user_name="User1", min_minutes_between_logs=10)
+    # same-day rule should block duplicates
+    assert result2.logged is False
 
-        df = store.attendance_df()
-        assert isinstance(df, pd.DataFrame)
-        assert len(df) == 1
-    finally:
-        os.environ.pop("FACEATTENDANCE_RUNTIME_DIR", None)
+    df = store.attendance_df()
+    assert isinstance(df, pd.DataFrame)
+    assert len(df) == 1
+
+
+def test_sync_from_csv_skips_blank_cells(tmp_path: Path) -> None:
+    users_csv = tmp_path / "UserDetails.csv"
+    users_csv.write_text("Id,Name\n1,User1\n2,\n", encoding="utf-8")
+    req_csv = tmp_path / "EnrollmentRequests.csv"
+    req_csv.write_text(
+        "RequestId,Name,Contact,Message,Timestamp,Status\n"
+        "1,User2,u2@example.com,hello,2025-01-01 09:00:00,\n",
+        encoding="utf-8",
+    )
+
+    store = Storage(tmp_path / "test.sqlite3")
+    summary = store.sync_from_csv(users_csv=users_csv, requests_csv=req_csv)
+    assert summary["users_upserted"] == 1
+    assert summary["requests_inserted"] == 1
+    assert store.requests_df()["Status"].tolist() == ["Pending"]
+
+
+def test_sync_from_csv_normalizes_attendance_timestamps(tmp_path: Path) -> None:
+    att_csv = tmp_path / "Attendance.csv"
+    att_csv.write_text(
+        "Id,Name,Date,Time\n"
+        "1,User1,2025-01-05,08:00:00\n"
+        "2,User2,2025-1-5,8:05:00\n"
+        "3,User3,someday,noon\n",
+        encoding="utf-8",
+    )
+
+    store = Storage(tmp_path / "test.sqlite3")
+    summary = store.sync_from_csv(attendance_csv=att_csv)
+    assert summary["attendance_inserted"] == 2
+    assert summary["attendance_rejected"] == 1
+    df = store.attendance_df()
+    assert df[["Id", "Date", "Time"]].values.tolist() == [
+        [1, "2025-01-05", "08:00:00"],
+        [2, "2025-01-05", "08:05:00"],
+    ]
+    # Re-running is still a no-op for rows already imported.
+    assert store.sync_from_csv(attendance_csv=att_csv)["attendance_inserted"] == 0
+
+
+def test_storage_uses_wal(tmp_path: Path) -> None:
+    store = Storage(tmp_path / "test.sqlite3")
+    with store._conn() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    store.checkpoint()
+
+
+def test_storage_pool_reuses_connections(tmp_path: Path) -> None:
+    store = Storage(tmp_path / "test.sqlite3")
+    with store._conn() as first:
+        pass
+    with store._conn() as second:
+        pass
+    assert first is second
+    store.close()
+
+
+def test_log_attendance_rate_limit(tmp_path: Path) -> None:
+    store = Storage(tmp_path / "test.sqlite3")
+    day1 = datetime(2025, 1, 1, 23, 55, 0)
+
+    first = store.log_attendance(user_id=1, user_name="User1", now=day1)
+    assert first.logged is True
+
+    # Next calendar day, but still inside the duplicate window.
+    early = store.log_attendance(user_id=1, user_name="User1", now=day1 + timedelta(minutes=9))
+    assert early.logged is False
+
+    later = store.log_attendance(user_id=1, user_name="User1", now=day1 + timedelta(minutes=10))
+    assert later.logged is True
+
+    # Without the one-per-day rule only the window applies.
+    again = store.log_attendance(
+        user_id=1,
+        user_name="User1",
+        now=day1 + timedelta(minutes=25),
+        enforce_one_per_day=False,
+    )
+    assert again.logged is True
+
+
+def test_export_attendance_csv(tmp_path: Path) -> None:
+    store = Storage(tmp_path / "test.sqlite3")
+    now = datetime(2025, 1, 15, 12, 0, 0)
+    store.log_attendance(user_id=1, user_name="User1", now=now - timedelta(days=20))
+    store.log_attendance(user_id=2, user_name="User2", now=now - timedelta(hours=1))
+
+    out = tmp_path / "out" / "daily.csv"
+    store.export_attendance_csv(out, period="daily", now=now)
+    df = pd.read_csv(out)
+    assert df.columns.tolist() == ["Id", "Name", "Date", "Time"]
+    assert df["Id"].tolist() == [2]
+
+    store.export_attendance_csv(out, period="all", now=now)
+    assert pd.read_csv(out)["Id"].tolist() == [1, 2]
+
+
+def test_export_users_csv(tmp_path: Path) -> None:
+    store = Storage(tmp_path / "test.sqlite3")
+    store.upsert_user(2, "User2")
+    store.upsert_user(1, "User1")
+
+    out = tmp_path / "out" / "UserDetails.csv"
+    store.export_users_csv(out)
+    df = pd.read_csv(out)
+    assert df.columns.tolist() == ["Id", "Name"]
+    assert df["Id"].tolist() == [1, 2]
+    assert df["Name"].tolist() == ["User1", "User2"]
+
+
+def test_reader_cache_invalidated_by_writes(tmp_path: Path) -> None:
+    store = Storage(tmp_path / "test.sqlite3")
+    store.add_request(name="A", contact="a@example.com", message="hi")
+    first = store.requests_df()
+    assert store.requests_df()["Status"].tolist() == ["Pending"]
+
+    store.update_request_status(int(first.iloc[0]["RequestId"]), "Rejected")
+    assert store.requests_df()["Status"].tolist() == ["Rejected"]
+
+    # Writes from another Storage instance (e.g. the enrollment process) are seen too.
+    Storage(tmp_path / "test.sqlite3").upsert_user(7, "Other")
+    store.users_df()
+    Storage(tmp_path / "test.sqlite3").upsert_user(8, "Another")
+    assert store.users_df()["Id"].tolist() == [7, 8]
+
+
+def test_reader_cache_sees_in_place_writes_from_other_instance(tmp_path: Path) -> None:
+    db = tmp_path / "test.sqlite3"
+    reader = Storage(db)
+    writer = Storage(db)
+    writer.upsert_user(5, "Alice")
+    writer.add_request(name="A", contact="a@example.com", message="hi")
+    assert reader.users_df()["Name"].tolist() == ["Alice"]
+    assert reader.requests_df()["Status"].tolist() == ["Pending"]
+
+    # Same row count and ids, new contents.
+    writer.upsert_user(5, "Bob")
+    writer.update_request_status(1, "Approved (ID 5)")
+    assert reader.users_df()["Name"].tolist() == ["Bob"]
+    assert reader.requests_df()["Status"].tolist() == ["Approved (ID 5)"]
+
+    # Delete and re-add the same id.
+    writer.delete_user(5)
+    writer.upsert_user(5, "Carol")
+    assert reader.users_df()["Name"].tolist() == ["Carol"]
+
+
+def test_csv_migration_runs_once(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("FACEATTENDANCE_RUNTIME_DIR", str(tmp_path))
+    users_csv = tmp_path / "data" / "UserDetails.csv"
+    users_csv.parent.mkdir(parents=True, exist_ok=True)
+    users_csv.write_text("Id,Name\n1,User1\n", encoding="utf-8")
+
+    store = Storage(tmp_path / "test.sqlite3")
+    store.migrate_from_csv_if_needed()
+    assert store.users_df()["Id"].tolist() == [1]
+
+    # Once flagged, later startups skip the CSVs even if tables are still empty.
+    users_csv.write_text("Id,Name\n1,User1\n2,User2\n", encoding="utf-8")
+    store.migrate_from_csv_if_needed()
+    assert store.users_df()["Id"].tolist() == [1]
+
+
+def test_schema_version_recorded(tmp_path: Path) -> None:
+    store = Storage(tmp_path / "test.sqlite3")
+    with store._conn() as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    # Reopening an up-to-date database keeps working without re-running the DDL.
+    Storage(tmp_path / "test.sqlite3").upsert_user(1, "User1")
+    assert store.users_df()["Id"].tolist() == [1]
+
+
+def test_legacy_attendance_layout_is_rebuilt(tmp_path: Path) -> None:
+    db_path = tmp_path / "test.sqlite3"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "CREATE TABLE attendance (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER "
+            "NOT NULL, name TEXT NOT NULL, ts TEXT NOT NULL, date TEXT NOT NULL, "
+            "time TEXT NOT NULL)"
+        )
+        conn.execute(
+            "INSERT INTO attendance(user_id, name, ts, date, time) "
+            "VALUES(1, 'User1', '2025-01-01 08:00:00', '2025-01-01', '08:00:00')"
+        )
+    conn.close()
+
+    store = Storage(db_path)
+    df = store.attendance_df()
+    assert df[["Date", "Time"]].values.tolist() == [["2025-01-01", "08:00:00"]]
+    result = store.log_attendance(user_id=1, user_name="User1", now=datetime(2025, 1, 1, 20, 0))
+    assert result.logged is False
+
+
+def test_legacy_rebuild_keeps_non_iso_timestamps(tmp_path: Path) -> None:
+    db_path = tmp_path / "test.sqlite3"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "CREATE TABLE attendance (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER "
+            "NOT NULL, name TEXT NOT NULL, ts TEXT NOT NULL, date TEXT NOT NULL, "
+            "time TEXT NOT NULL)"
+        )
+        conn.executemany(
+            "INSERT INTO attendance(user_id, name, ts, date, time) VALUES(?, ?, ?, ?, ?)",
+            [
+                (1, "User1", "2025-1-5 8:00:00", "2025-1-5", "8:00:00"),
+                (2, "User2", "2025-01-06 09:30:00", "2025-01-06", "09:30:00"),
+                (3, "User3", "not a time", "?", "?"),
+            ],
+        )
+    conn.close()
+
+    store = Storage(db_path)
+    df = store.attendance_df()
+    assert df[["Id", "Date", "Time"]].values.tolist() == [
+        [1, "2025-01-05", "08:00:00"],
+        [2, "2025-01-06", "09:30:00"],
+    ]
+    with store._conn() as conn:
+        kept = conn.execute("SELECT user_id, ts FROM attendance_unparsed").fetchall()
+    assert kept == [(3, "not a time")]
+
+
+def test_pending_request_count(tmp_path: Path) -> None:
+    store = Storage(tmp_path / "test.sqlite3")
+    assert store.pending_request_count() == 0
+    store.add_request(name="A", contact="a@example.com", message="hi")
+    store.add_request(name="B", contact="b@example.com", message="hi")
+    store.update_request_status(1, "Approved (ID 3)")
+    assert store.pending_request_count() == 1